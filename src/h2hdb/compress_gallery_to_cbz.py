@@ -4,13 +4,13 @@ import os
 from PIL import Image, ImageFile  # type: ignore
 import zipfile
 import shutil
-import hashlib
 
 Image.MAX_IMAGE_PIXELS = None
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
 from .settings import FILE_NAME_LENGTH_LIMIT, COMPARISON_HASH_ALGORITHM
-from .settings import hash_function_by_file
+from .settings import HASH_CHUNK_SIZE
+from .settings import hash_function_by_file, get_hash_constructor
 
 
 def compress_image(image_path: str, output_path: str, max_size: int) -> None:
@@ -127,9 +127,11 @@ def calculate_hash_of_file_in_cbz(
     if zipfile.is_zipfile(cbz_path):
         with zipfile.ZipFile(cbz_path, "r") as myzip:
             with myzip.open(file_name) as myfile:
-                file_content = myfile.read()
-                hash_object = hashlib.new(algorithm)
-                hash_object.update(file_content)
+                # The member is decompressed chunk by chunk, so it is never
+                # held in memory as a whole.
+                hash_object = get_hash_constructor(algorithm)()
+                while chunk := myfile.read(HASH_CHUNK_SIZE):
+                    hash_object.update(chunk)
                 hash_of_file = hash_object.digest()
     else:
         hash_of_file = bytes(0)
@@ -4,6 +4,12 @@ import os
 import argparse
 import json
 
+from .settings import (
+    COMPARISON_HASH_ALGORITHM,
+    HASH_ALGORITHMS,
+    DEFAULT_HASH_ALGORITHMS,
+)
+
 
 class ConfigError(Exception):
     """
@@ -85,6 +91,7 @@ class H2HConfig:
         "cbz_grouping",
         "cbz_tmp_directory",
         "cbz_sort",
+        "hash_algorithms",
     ]
 
     def __init__(
@@ -94,12 +101,14 @@ class H2HConfig:
         cbz_max_size: int,
         cbz_grouping: str,
         cbz_sort: str,
+        hash_algorithms: list[str],
     ) -> None:
         self.download_path = download_path
         self.cbz_path = cbz_path
         self.cbz_max_size = cbz_max_size
         self.cbz_grouping = cbz_grouping
         self.cbz_sort = cbz_sort
+        self.hash_algorithms = hash_algorithms
 
         if not isinstance(download_path, str):
             raise TypeError("download_path must be a string")
@@ -116,6 +125,27 @@ class H2HConfig:
         if not isinstance(cbz_sort, str):
             raise TypeError("cbz_sort must be a string")
 
+        if not isinstance(hash_algorithms, list) or not all(
+            isinstance(algorithm, str) for algorithm in hash_algorithms
+        ):
+            raise TypeError("hash_algorithms must be a list of strings")
+
+        for algorithm in hash_algorithms:
+            if algorithm not in HASH_ALGORITHMS:
+                raise ConfigError(
+                    f"Invalid hash algorithm {algorithm} (must be one of {', '.join(HASH_ALGORITHMS)})"
+                )
+
+        if len(set(hash_algorithms)) != len(hash_algorithms):
+            raise ConfigError(
+                f"hash_algorithms must not contain duplicates: {', '.join(hash_algorithms)}"
+            )
+
+        if COMPARISON_HASH_ALGORITHM not in hash_algorithms:
+            raise ConfigError(
+                f"hash_algorithms must contain {COMPARISON_HASH_ALGORITHM}"
+            )
+
         self.cbz_tmp_directory = os.path.join(self.cbz_path, "tmp")
 
 
@@ -147,12 +177,13 @@ class H2HDBConfig:
 
 def set_default_config() -> dict[str, dict]:
     return dict[str, dict](
-        h2h=dict[str, str | int](
+        h2h=dict[str, str | int | list[str]](
             download_path="download",
             cbz_path="",
             cbz_max_size=768,
             cbz_grouping="flat",
             cbz_sort="no",
+            hash_algorithms=list(DEFAULT_HASH_ALGORITHMS),
         ),
         database=dict[str, str](
             sql_type="mysql",
@@ -199,8 +230,13 @@ def load_config(config_path: str = "") -> H2HDBConfig:
         user_config["h2h"].pop("cbz_sort")
     else:
         cbz_sort = default_config["h2h"]["cbz_sort"]
+    if "hash_algorithms" in user_config["h2h"]:
+        hash_algorithms = user_config["h2h"]["hash_algorithms"]
+        user_config["h2h"].pop("hash_algorithms")
+    else:
+        hash_algorithms = default_config["h2h"]["hash_algorithms"]
     h2h_config = H2HConfig(
-        download_path, cbz_path, cbz_max_size, cbz_grouping, cbz_sort
+        download_path, cbz_path, cbz_max_size, cbz_grouping, cbz_sort, hash_algorithms
     )
     if len(user_config["h2h"]) > 0:
         raise ConfigError("Invalid configuration for h2h")
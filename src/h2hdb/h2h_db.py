@@ -2,14 +2,15 @@ __all__ = ["H2HDB", "GALLERY_INFO_FILE_NAME"]
 
 
 from abc import ABCMeta, abstractmethod
+from multiprocessing.pool import AsyncResult
 import datetime
-import re
 import os
 import math
 from itertools import islice, chain
-from functools import partial
-from random import shuffle
-from time import sleep
+from functools import partial, cache, cached_property, lru_cache
+from hashlib import sha256
+from time import sleep, monotonic
+from typing import Iterator
 
 from h2h_galleryinfo_parser import (
     parse_galleryinfo,
@@ -23,17 +24,77 @@ from .sql_connector import (
     DatabaseConfigurationError,
     DatabaseKeyError,
     DatabaseDuplicateKeyError,
+    DatabaseTransactionError,
 )
-from .threading_tools import SQLThreadsList, run_in_parallel, POOL_CPU_LIMIT
-from .settings import hash_function_by_file, hash_function, chunk_list
+from .threading_tools import (
+    SQLThreadsList,
+    create_process_pool,
+    run_in_parallel,
+    submit_in_parallel,
+    submit_in_threads,
+    POOL_CPU_LIMIT,
+)
+from .settings import hash_functions_by_file, chunk_list
 from .settings import (
     FOLDER_NAME_LENGTH_LIMIT,
     FILE_NAME_LENGTH_LIMIT,
     COMPARISON_HASH_ALGORITHM,
     GALLERY_INFO_FILE_NAME,
+    HASH_ALGORITHMS,
+    DB_GALLERY_ID_CACHE_SIZE,
+    SPLIT_NAME_CACHE_SIZE,
+    MULTI_ROW_INSERT_SIZE,
+    ACCESS_TIME_FLUSH_SIZE,
+    ACCESS_TIME_FLUSH_SECONDS,
+    TRANSACTION_RETRY_LIMIT,
 )
 
-HASH_ALGORITHMS = dict[str, int](sha512=512, sha3_512=512, blake2b=512)
+
+# The same gallery and file names are split again by every query that looks
+# them up, so recent splits are kept. The parts are returned as a tuple, since
+# the cached value is shared between callers.
+@lru_cache(maxsize=SPLIT_NAME_CACHE_SIZE)
+def split_name_by_limit(name: str, innodb_index_prefix_limit: int) -> tuple[str, ...]:
+    limit = innodb_index_prefix_limit
+    size = FOLDER_NAME_LENGTH_LIMIT // limit + (FOLDER_NAME_LENGTH_LIMIT % limit > 0)
+    if len(name) <= limit:
+        # Most names fit in the first part, which needs no slicing at all.
+        return (name,) + ("",) * (size - 1)
+    name_parts = tuple(name[i : i + limit] for i in range(0, len(name), limit))
+    return name_parts + ("",) * (size - len(name_parts))
+
+
+# The column layout only depends on its arguments, so it is built once per
+# combination instead of on every query.
+@cache
+def mysql_split_name_based_on_limit(
+    name: str, name_length_limit: int, innodb_index_prefix_limit: int
+) -> tuple[list[str], str]:
+    num_parts = math.ceil(name_length_limit / innodb_index_prefix_limit)
+    name_parts = [
+        f"{name}_part{i} CHAR({innodb_index_prefix_limit}) NOT NULL"
+        for i in range(1, name_length_limit // innodb_index_prefix_limit + 1)
+    ]
+    if name_length_limit % innodb_index_prefix_limit > 0:
+        name_parts.append(
+            f"{name}_part{num_parts} CHAR({name_length_limit % innodb_index_prefix_limit}) NOT NULL"
+        )
+    column_name_parts = [f"{name}_part{i}" for i in range(1, num_parts + 1)]
+    create_name_parts_sql = ", ".join(name_parts)
+    return column_name_parts, create_name_parts_sql
+
+
+# The name columns of galleries and files are fixed for MySQL, so their layout
+# is resolved once at import instead of inside every query builder.
+MYSQL_INNODB_INDEX_PREFIX_LIMIT = 191
+MYSQL_GALLERY_NAME_PARTS, MYSQL_GALLERY_NAME_PARTS_DDL = (
+    mysql_split_name_based_on_limit(
+        "name", FOLDER_NAME_LENGTH_LIMIT, MYSQL_INNODB_INDEX_PREFIX_LIMIT
+    )
+)
+MYSQL_FILE_NAME_PARTS, MYSQL_FILE_NAME_PARTS_DDL = mysql_split_name_based_on_limit(
+    "name", FILE_NAME_LENGTH_LIMIT, MYSQL_INNODB_INDEX_PREFIX_LIMIT
+)
 
 
 def get_sorting_base_level(x: int = 20) -> int:
@@ -41,24 +102,26 @@ def get_sorting_base_level(x: int = 20) -> int:
     return zero_level
 
 
-class FileInformation:
-    def __init__(self, absolute_path: str, db_file_id: int) -> None:
-        self.absolute_path = absolute_path
-        self.db_file_id = db_file_id
-        self.issethash = False
-        self.db_hash_id = dict[str, int]()
-
-    def sethash(self) -> None:
-        if not self.issethash:
-            with open(self.absolute_path, "rb") as file:
-                file_content = file.read()
-            algorithmlist = list(HASH_ALGORITHMS.keys())
-            for algorithm in algorithmlist:
-                setattr(self, algorithm, hash_function(file_content, algorithm))
-            self.issethash = True
-
-    def setdb_hash_id(self, algorithm: str, db_hash_id: int) -> None:
-        self.db_hash_id[algorithm] = db_hash_id
+def walk_gallery_folders(root: str) -> Iterator[str]:
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        # As with os.walk, a folder that is missing or cannot be read is
+        # skipped instead of aborting the scan.
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                stack.append(entry.path)
+            elif entry.name == GALLERY_INFO_FILE_NAME:
+                yield folder
 
 
 class TagInformation:
@@ -75,6 +138,7 @@ class TagInformation:
 class H2HDBAbstract(metaclass=ABCMeta):
     __slots__ = [
         "sql_connection_params",
+        "sql_type",
         "innodb_index_prefix_limit",
         "config",
         "SQLConnector",
@@ -90,9 +154,11 @@ class H2HDBAbstract(metaclass=ABCMeta):
         """
         self.config = config
         self.logger = setup_logger(config.logger)
+        # Resolved once; every query dispatches on it.
+        self.sql_type = self.config.database.sql_type.lower()
 
         # Set the appropriate connector based on the SQL type
-        match self.config.database.sql_type.lower():
+        match self.sql_type:
             case "mysql":
                 from .mysql_connector import MySQLConnectorParams, MySQLConnector
 
@@ -106,7 +172,7 @@ class H2HDBAbstract(metaclass=ABCMeta):
                 self.SQLConnector = partial(
                     MySQLConnector, **self.sql_connection_params
                 )
-                self.innodb_index_prefix_limit = 191
+                self.innodb_index_prefix_limit = MYSQL_INNODB_INDEX_PREFIX_LIMIT
             case _:
                 raise ValueError("Unsupported SQL type")
 
@@ -114,43 +180,24 @@ class H2HDBAbstract(metaclass=ABCMeta):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        if exc_type is None:
-            with self.SQLConnector() as connector:
-                connector.commit()
+        try:
+            self.close()
+        finally:
+            if exc_type is None:
+                with self.SQLConnector() as connector:
+                    connector.commit()
 
-    def _split_gallery_name(self, gallery_name: str) -> list[str]:
-        size = FOLDER_NAME_LENGTH_LIMIT // self.innodb_index_prefix_limit + (
-            FOLDER_NAME_LENGTH_LIMIT % self.innodb_index_prefix_limit > 0
-        )
-        gallery_name_parts = re.findall(
-            f".{{1,{self.innodb_index_prefix_limit}}}", gallery_name
-        )
-        gallery_name_parts += [""] * (size - len(gallery_name_parts))
-        return gallery_name_parts
-
-    def _mysql_split_name_based_on_limit(
-        self, name: str, name_length_limit: int
-    ) -> tuple[list[str], str]:
-        num_parts = math.ceil(name_length_limit / self.innodb_index_prefix_limit)
-        name_parts = [
-            f"{name}_part{i} CHAR({self.innodb_index_prefix_limit}) NOT NULL"
-            for i in range(1, name_length_limit // self.innodb_index_prefix_limit + 1)
-        ]
-        if name_length_limit % self.innodb_index_prefix_limit > 0:
-            name_parts.append(
-                f"{name}_part{num_parts} CHAR({name_length_limit % self.innodb_index_prefix_limit}) NOT NULL"
-            )
-        column_name_parts = [f"{name}_part{i}" for i in range(1, num_parts + 1)]
-        create_name_parts_sql = ", ".join(name_parts)
-        return column_name_parts, create_name_parts_sql
+    def close(self) -> None:
+        """
+        Writes the changes still buffered by this object to the database.
 
-    def mysql_split_gallery_name_based_on_limit(
-        self, name: str
-    ) -> tuple[list[str], str]:
-        return self._mysql_split_name_based_on_limit(name, FOLDER_NAME_LENGTH_LIMIT)
+        It is called when a 'with' block exits, whether or not the block raised.
+        Call it directly when the object is used without 'with'.
+        """
+        pass
 
-    def mysql_split_file_name_based_on_limit(self, name: str) -> tuple[list[str], str]:
-        return self._mysql_split_name_based_on_limit(name, FILE_NAME_LENGTH_LIMIT)
+    def _split_gallery_name(self, gallery_name: str) -> tuple[str, ...]:
+        return split_name_by_limit(gallery_name, self.innodb_index_prefix_limit)
 
     @abstractmethod
     def check_database_character_set(self) -> None:
@@ -244,6 +291,9 @@ class H2HDBAbstract(metaclass=ABCMeta):
         """
         Updates the access time for the gallery in the database.
 
+        The time is buffered and written together with other access times. It
+        is written at the latest by 'close', which a 'with' block calls on exit.
+
         Args:
             gallery_name (str): The name of the gallery.
             time (str): The access time.
@@ -335,6 +385,16 @@ class H2HDBAbstract(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def insert_pending_gallery_removals(self, gallery_names: list[str]) -> None:
+        """
+        Inserts several pending gallery removals into the database at once.
+
+        Args:
+            gallery_names (list[str]): The names of the galleries.
+        """
+        pass
+
     @abstractmethod
     def check_pending_gallery_removal(self, gallery_name: str) -> bool:
         """
@@ -477,6 +537,16 @@ class H2HDBAbstract(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def insert_todelete_gids(self, gids: list[int]) -> None:
+        """
+        Inserts several GIDs to be deleted into the database at once.
+
+        Args:
+            gids (list[int]): The gallery GIDs.
+        """
+        pass
+
     @abstractmethod
     def update_redownload_time_to_now_by_gid(self, gid: int) -> None:
         """
@@ -512,7 +582,7 @@ class H2HDBCheckDatabaseSettings(H2HDBAbstract, metaclass=ABCMeta):
             DatabaseConfigurationError: If the database character set is invalid.
         """
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     charset = "utf8mb4"
                     query = "SHOW VARIABLES LIKE 'character_set_database';"
@@ -533,7 +603,7 @@ class H2HDBCheckDatabaseSettings(H2HDBAbstract, metaclass=ABCMeta):
             DatabaseConfigurationError: If the database collation is invalid.
         """
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = "SHOW VARIABLES LIKE 'collation_database';"
                     collation = "utf8mb4_bin"
@@ -551,12 +621,10 @@ class H2HDBGalleriesIDs(H2HDBAbstract, metaclass=ABCMeta):
     def _create_galleries_names_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    column_name = "name"
-                    column_name_parts, create_gallery_name_parts_sql = (
-                        self.mysql_split_gallery_name_based_on_limit(column_name)
-                    )
+                    column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                    create_gallery_name_parts_sql = MYSQL_GALLERY_NAME_PARTS_DDL
                     id_query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
                             PRIMARY KEY (db_gallery_id),
@@ -568,7 +636,7 @@ class H2HDBGalleriesIDs(H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(id_query)
 
             table_name = "galleries_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     name_query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -576,84 +644,181 @@ class H2HDBGalleriesIDs(H2HDBAbstract, metaclass=ABCMeta):
                             FOREIGN KEY (db_gallery_id) REFERENCES galleries_dbids(db_gallery_id)
                                 ON UPDATE CASCADE
                                 ON DELETE CASCADE,
-                            db_gallery_id INT  UNSIGNED NOT NULL,
-                            full_name     TEXT          NOT NULL,
-                            FULLTEXT (full_name)
+                            db_gallery_id    INT  UNSIGNED NOT NULL,
+                            full_name        TEXT          NOT NULL,
+                            full_name_sha256 BINARY(32)
+                                GENERATED ALWAYS AS (UNHEX(SHA2(full_name, 256))) STORED,
+                            FULLTEXT (full_name),
+                            UNIQUE (full_name_sha256)
                         )
                     """
+                    # Tables created before the digest column existed get it
+                    # added in place.
+                    column_query = f"""
+                        SHOW COLUMNS FROM {table_name} LIKE 'full_name_sha256'
+                    """
+                    alter_query = f"""
+                        ALTER TABLE {table_name}
+                            ADD COLUMN full_name_sha256 BINARY(32)
+                                GENERATED ALWAYS AS (UNHEX(SHA2(full_name, 256))) STORED,
+                            ADD UNIQUE (full_name_sha256)
+                    """
             connector.execute(name_query)
+            if connector.fetch_one(column_query) is None:
+                connector.execute(alter_query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_gallery_name(self, gallery_name: str) -> None:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_dbids"
-            gallery_name_parts = self._split_gallery_name(gallery_name)
-
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    insert_query = f"""
-                        INSERT INTO {table_name}
-                            ({", ".join(column_name_parts)})
-                        VALUES ({", ".join(["%s" for _ in column_name_parts])})
-                    """
-            connector.execute(insert_query, tuple(gallery_name_parts))
-
-            db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
+    @cached_property
+    def _insert_gallery_name_query(self) -> str:
+        table_name = "galleries_dbids"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                insert_query = f"""
+                    INSERT INTO {table_name}
+                        ({", ".join(column_name_parts)})
+                    VALUES ({", ".join(["%s" for _ in column_name_parts])})
+                """
+        return insert_query
+
+    @cached_property
+    def _insert_gallery_full_name_query(self) -> str:
+        table_name = "galleries_names"
+        match self.sql_type:
+            case "mysql":
+                insert_query = f"""
+                    INSERT INTO {table_name}
+                        (db_gallery_id, full_name)
+                    VALUES (%s, %s)
+                """
+        return insert_query
 
-            table_name = "galleries_names"
+    def _insert_gallery_name(self, gallery_name: str) -> int:
+        with self.SQLConnector() as connector:
             gallery_name_parts = self._split_gallery_name(gallery_name)
+            db_gallery_id = connector.execute_returning_id(
+                self._insert_gallery_name_query, tuple(gallery_name_parts)
+            )
+            connector.execute(
+                self._insert_gallery_full_name_query, (db_gallery_id, gallery_name)
+            )
+        return db_gallery_id
 
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    insert_query = f"""
-                        INSERT INTO {table_name}
-                            (db_gallery_id, full_name)
-                        VALUES (%s, %s)
-                    """
-            connector.execute(insert_query, (db_gallery_id, gallery_name))
+    @cached_property
+    def _select_db_gallery_id_query(self) -> str:
+        table_name = "galleries_names"
+        match self.sql_type:
+            case "mysql":
+                select_query = f"""
+                    SELECT db_gallery_id
+                    FROM {table_name}
+                    WHERE full_name_sha256 = %s
+                """
+        return select_query
 
     def __get_db_gallery_id_by_gallery_name(self, gallery_name: str) -> tuple | None:
+        # The digest is taken here, so the lookup is a single probe of the
+        # unique digest index instead of one comparison per name part.
         with self.SQLConnector() as connector:
-            table_name = "galleries_dbids"
-            gallery_name_parts = self._split_gallery_name(gallery_name)
-
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    select_query = f"""
-                        SELECT db_gallery_id
-                        FROM {table_name}
-                        WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
-                    """
-
-            query_result = connector.fetch_one(select_query, tuple(gallery_name_parts))
+            query_result = connector.fetch_one(
+                self._select_db_gallery_id_query,
+                (sha256(gallery_name.encode("utf-8")).digest(),),
+            )
         return query_result
 
+    @cached_property
+    def _db_gallery_id_cache(self) -> dict[str, int]:
+        # Gallery IDs resolved by this process, so that repeated lookups of the
+        # same gallery cost one query. Entries are dropped whenever this process
+        # removes the gallery; see also __getstate__.
+        return dict[str, int]()
+
+    _process_local_attributes = ("_db_gallery_id_cache",)
+
+    def __getstate__(self) -> object:
+        # Worker processes start without the parent's resolved IDs, which go
+        # stale once a gallery is reinserted by another process.
+        state = super().__getstate__()
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
+        else:
+            dict_state, slots_state = state, None
+        # The instance dictionary is reported as None while it is still empty.
+        dict_state = {
+            key: value
+            for key, value in (dict_state or {}).items()
+            if key not in self._process_local_attributes
+        }
+        return dict_state if slots_state is None else (dict_state, slots_state)
+
+    def _forget_db_gallery_id(self, gallery_name: str) -> None:
+        self._db_gallery_id_cache.pop(gallery_name, None)
+
     def _check_galleries_dbids_by_gallery_name(self, gallery_name: str) -> bool:
+        if gallery_name in self._db_gallery_id_cache:
+            return True
         query_result = self.__get_db_gallery_id_by_gallery_name(gallery_name)
         return query_result is not None
 
     def _get_db_gallery_id_by_gallery_name(self, gallery_name: str) -> int:
+        db_gallery_id = self._db_gallery_id_cache.get(gallery_name)
+        if db_gallery_id is not None:
+            return db_gallery_id
         query_result = self.__get_db_gallery_id_by_gallery_name(gallery_name)
         if query_result is None:
-            self.logger.debug(f"Gallery name '{gallery_name}' does not exist.")
+            self.logger.debug("Gallery name '%s' does not exist.", gallery_name)
             raise DatabaseKeyError(f"Gallery name '{gallery_name}' does not exist.")
         else:
             db_gallery_id = query_result[0]
+        self._remember_db_gallery_id(gallery_name, db_gallery_id)
         return db_gallery_id
 
+    def _remember_db_gallery_id(self, gallery_name: str, db_gallery_id: int) -> None:
+        if len(self._db_gallery_id_cache) >= DB_GALLERY_ID_CACHE_SIZE:
+            self._db_gallery_id_cache.clear()
+        self._db_gallery_id_cache[gallery_name] = db_gallery_id
+
+    @cached_property
+    def _select_value_by_gallery_name_queries(self) -> dict[tuple[str, str], str]:
+        return dict[tuple[str, str], str]()
+
+    def _get_db_gallery_id_and_value_by_gallery_name(
+        self, gallery_name: str, table_name: str, column_name: str
+    ) -> tuple[int, object]:
+        # Resolves the gallery and reads the column in one statement, instead of
+        # a lookup of the ID followed by a read keyed on it. The value is None if
+        # the gallery has no row in the table.
+        select_query = self._select_value_by_gallery_name_queries.get(
+            (table_name, column_name)
+        )
+        if select_query is None:
+            match self.sql_type:
+                case "mysql":
+                    select_query = f"""
+                        SELECT galleries_names.db_gallery_id, {table_name}.{column_name}
+                        FROM galleries_names
+                        LEFT JOIN {table_name} USING (db_gallery_id)
+                        WHERE galleries_names.full_name_sha256 = %s
+                    """
+            self._select_value_by_gallery_name_queries[(table_name, column_name)] = (
+                select_query
+            )
+
+        with self.SQLConnector() as connector:
+            query_result = connector.fetch_one(
+                select_query, (sha256(gallery_name.encode("utf-8")).digest(),)
+            )
+        if query_result is None:
+            self.logger.debug("Gallery name '%s' does not exist.", gallery_name)
+            raise DatabaseKeyError(f"Gallery name '{gallery_name}' does not exist.")
+        db_gallery_id, value = query_result
+        self._remember_db_gallery_id(gallery_name, db_gallery_id)
+        return db_gallery_id, value
+
     def _get_db_gallery_id_by_gid(self, gid: int) -> int:
         with self.SQLConnector() as connector:
             table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT db_gallery_id
@@ -683,14 +848,13 @@ class H2HDBGalleriesGIDs(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
 
     Methods:
         _create_galleries_gids_table: Creates the galleries_gids table.
-        _insert_gallery_gid: Inserts the GID for the gallery name ID into the galleries_gids table.
         get_gid_by_gallery_name: Selects the GID for the gallery name from the database.
     """
 
     def _create_galleries_gids_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -706,56 +870,32 @@ class H2HDBGalleriesGIDs(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_gallery_gid(self, db_gallery_id: int, gid: int) -> None:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query = f"""
-                        INSERT INTO {table_name} (db_gallery_id, gid) VALUES (%s, %s)
-                    """
-            connector.execute(insert_query, (db_gallery_id, gid))
-
-    def _get_gid_by_db_gallery_id(self, db_gallery_id: int) -> int:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT gid
-                        FROM {table_name}
-                        WHERE db_gallery_id = %s
-                    """
-            query_result = connector.fetch_one(select_query, (db_gallery_id,))
-            if query_result is None:
-                msg = f"GID for gallery name ID {db_gallery_id} does not exist."
-                self.logger.error(msg)
-                raise DatabaseKeyError(msg)
-            else:
-                gid = query_result[0]
-        return gid
-
     def get_gid_by_gallery_name(self, gallery_name: str) -> int:
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        return self._get_gid_by_db_gallery_id(db_gallery_id)
+        db_gallery_id, gid = self._get_db_gallery_id_and_value_by_gallery_name(
+            gallery_name, "galleries_gids", "gid"
+        )
+        if gid is None:
+            msg = f"GID for gallery name ID {db_gallery_id} does not exist."
+            self.logger.error(msg)
+            raise DatabaseKeyError(msg)
+        return gid  # type: ignore
 
     def get_gids(self) -> list[int]:
         with self.SQLConnector() as connector:
             table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT gid
                         FROM {table_name}
                     """
-            query_result = connector.fetch_all(select_query)
-            gids = [gid for gid, in query_result]
+            gids = [gid for gid, in connector.fetch_iter(select_query)]
         return gids
 
     def check_gid_by_gid(self, gid: int) -> bool:
         with self.SQLConnector() as connector:
             table_name = "galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT gid
@@ -770,7 +910,7 @@ class H2HDBGalleriesGIDs(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
 class H2HDBTimes(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_times_table(self, table_name: str) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -786,41 +926,31 @@ class H2HDBTimes(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_time(self, table_name: str, db_gallery_id: int, time: str) -> None:
-        with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query = f"""
-                        INSERT INTO {table_name} (db_gallery_id, time) VALUES (%s, %s)
-                    """
-            connector.execute(insert_query, (db_gallery_id, time))
-
-    def _select_time(self, table_name: str, db_gallery_id: int) -> datetime.datetime:
-        with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT time
-                        FROM {table_name}
-                        WHERE db_gallery_id = %s
+    time_table_names = (
+        "galleries_download_times",
+        "galleries_redownload_times",
+        "galleries_upload_times",
+        "galleries_modified_times",
+        "galleries_access_times",
+    )
+
+    @cached_property
+    def _update_time_queries(self) -> dict[str, str]:
+        match self.sql_type:
+            case "mysql":
+                update_queries = {
+                    table_name: f"""
+                        UPDATE {table_name} SET time = %s WHERE db_gallery_id = %s
                     """
-            query_result = connector.fetch_one(select_query, (db_gallery_id,))
-            if query_result is None:
-                msg = f"Time for gallery name ID {db_gallery_id} does not exist in table '{table_name}'."
-                self.logger.error(msg)
-                raise DatabaseKeyError(msg)
-            else:
-                time = query_result[0]
-        return time
+                    for table_name in self.time_table_names
+                }
+        return update_queries
 
     def _update_time(self, table_name: str, db_gallery_id: int, time: str) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    update_query = f"""
-                        UPDATE {table_name} SET time = %s WHERE db_gallery_id = %s
-                    """
-            connector.execute(update_query, (time, db_gallery_id))
+            connector.execute(
+                self._update_time_queries[table_name], (time, db_gallery_id)
+            )
 
     def _create_galleries_download_times_table(self) -> None:
         self._create_times_table("galleries_download_times")
@@ -828,17 +958,13 @@ class H2HDBTimes(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_galleries_redownload_times_table(self) -> None:
         self._create_times_table("galleries_redownload_times")
 
-    def _insert_download_time(self, db_gallery_id: int, time: str) -> None:
-        self._insert_time("galleries_download_times", db_gallery_id, time)
-        self._insert_time("galleries_redownload_times", db_gallery_id, time)
-
     def update_redownload_time(self, db_gallery_id: int, time: str) -> None:
         self._update_time("galleries_redownload_times", db_gallery_id, time)
 
     def _reset_redownload_times(self) -> None:
         table_name = "galleries_redownload_times"
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     update_query = f"""
                         UPDATE {table_name}
@@ -853,35 +979,82 @@ class H2HDBTimes(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_galleries_upload_times_table(self) -> None:
         self._create_times_table("galleries_upload_times")
 
-    def _insert_upload_time(self, db_gallery_id: int, time: str) -> None:
-        self._insert_time("galleries_upload_times", db_gallery_id, time)
-
     def get_upload_time_by_gallery_name(self, gallery_name: str) -> datetime.datetime:
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        return self._select_time("galleries_upload_times", db_gallery_id)
+        table_name = "galleries_upload_times"
+        db_gallery_id, time = self._get_db_gallery_id_and_value_by_gallery_name(
+            gallery_name, table_name, "time"
+        )
+        if time is None:
+            msg = f"Time for gallery name ID {db_gallery_id} does not exist in table '{table_name}'."
+            self.logger.error(msg)
+            raise DatabaseKeyError(msg)
+        return time  # type: ignore
 
     def _create_galleries_modified_times_table(self) -> None:
         self._create_times_table("galleries_modified_times")
 
-    def _insert_modified_time(self, db_gallery_id: int, time: str) -> None:
-        self._insert_time("galleries_modified_times", db_gallery_id, time)
-
     def _create_galleries_access_times_table(self) -> None:
         self._create_times_table("galleries_access_times")
 
-    def _insert_access_time(self, db_gallery_id: int, time: str) -> None:
-        self._insert_time("galleries_access_times", db_gallery_id, time)
+    # Access times are buffered per gallery and written together, so repeated
+    # accesses to the same gallery cost one row in one statement. Pending times
+    # are written once the buffer is large or old enough, and on close.
+    _process_local_attributes = H2HDBGalleriesIDs._process_local_attributes + (
+        "_pending_access_times",
+        "_access_times_flushed_at",
+    )
+
+    @cached_property
+    def _pending_access_times(self) -> dict[int, str]:
+        return dict[int, str]()
+
+    @cached_property
+    def _access_times_flushed_at(self) -> float:
+        return monotonic()
 
     def update_access_time(self, gallery_name: str, time: str) -> None:
         db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        self._update_time("galleries_access_times", db_gallery_id, time)
+        self._pending_access_times[db_gallery_id] = time
+        if (
+            len(self._pending_access_times) >= ACCESS_TIME_FLUSH_SIZE
+            or monotonic() - self._access_times_flushed_at >= ACCESS_TIME_FLUSH_SECONDS
+        ):
+            self._flush_access_times()
+
+    def _flush_access_times(self) -> None:
+        pending_access_times = self._pending_access_times
+        self._pending_access_times = dict[int, str]()
+        self._access_times_flushed_at = monotonic()
+        if len(pending_access_times) == 0:
+            return
+
+        table_name = "galleries_access_times"
+        match self.sql_type:
+            case "mysql":
+                # An UPDATE joined to the buffered rows, so galleries removed in
+                # the meantime are skipped instead of breaking the foreign key.
+                update_query = f"""
+                    UPDATE {table_name}
+                    JOIN (
+                        {" UNION ALL ".join(["SELECT %s AS db_gallery_id, %s AS time" for _ in pending_access_times])}
+                    ) AS pending_access_times USING (db_gallery_id)
+                    SET {table_name}.time = pending_access_times.time
+                """
+        with self.SQLConnector() as connector:
+            connector.execute(
+                update_query, tuple(chain(*pending_access_times.items()))
+            )
+
+    def close(self) -> None:
+        self._flush_access_times()
+        super().close()
 
 
 class H2HDBGalleriesTitles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_galleries_titles_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_titles"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -897,45 +1070,22 @@ class H2HDBGalleriesTitles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_gallery_title(self, db_gallery_id: int, title: str) -> None:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_titles"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query = f"""
-                        INSERT INTO {table_name} (db_gallery_id, title) VALUES (%s, %s)
-                    """
-            connector.execute(insert_query, (db_gallery_id, title))
-
-    def _get_title_by_db_gallery_id(self, db_gallery_id: int) -> str:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_titles"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT title
-                        FROM {table_name}
-                        WHERE db_gallery_id = %s
-                    """
-            query_result = connector.fetch_one(select_query, (db_gallery_id,))
-            if query_result is None:
-                msg = f"Title for gallery name ID {db_gallery_id} does not exist."
-                self.logger.error(msg)
-                raise DatabaseKeyError(msg)
-            else:
-                title = query_result[0]
-        return title
-
     def get_title_by_gallery_name(self, gallery_name: str) -> str:
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        return self._get_title_by_db_gallery_id(db_gallery_id)
+        db_gallery_id, title = self._get_db_gallery_id_and_value_by_gallery_name(
+            gallery_name, "galleries_titles", "title"
+        )
+        if title is None:
+            msg = f"Title for gallery name ID {db_gallery_id} does not exist."
+            self.logger.error(msg)
+            raise DatabaseKeyError(msg)
+        return title  # type: ignore
 
 
 class H2HDBUploadAccounts(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_upload_account_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_upload_accounts"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -951,38 +1101,15 @@ class H2HDBUploadAccounts(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_gallery_upload_account(self, db_gallery_id: int, account: str) -> None:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_upload_accounts"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query = f"""
-                        INSERT INTO {table_name} (db_gallery_id, account) VALUES (%s, %s)
-                    """
-            connector.execute(insert_query, (db_gallery_id, account))
-
-    def _select_gallery_upload_account(self, db_gallery_id: int) -> str:
-        with self.SQLConnector() as connector:
-            table_name = "galleries_upload_accounts"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT account
-                        FROM {table_name}
-                        WHERE db_gallery_id = %s
-                    """
-            query_result = connector.fetch_one(select_query, (db_gallery_id,))
-            if query_result is None:
-                msg = f"Upload account for gallery name ID {db_gallery_id} does not exist."
-                self.logger.error(msg)
-                raise DatabaseKeyError(msg)
-            else:
-                account = query_result[0]
-        return account
-
     def get_upload_account_by_gallery_name(self, gallery_name: str) -> str:
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        return self._select_gallery_upload_account(db_gallery_id)
+        db_gallery_id, account = self._get_db_gallery_id_and_value_by_gallery_name(
+            gallery_name, "galleries_upload_accounts", "account"
+        )
+        if account is None:
+            msg = f"Upload account for gallery name ID {db_gallery_id} does not exist."
+            self.logger.error(msg)
+            raise DatabaseKeyError(msg)
+        return account  # type: ignore
 
 
 class H2HDBGalleriesInfos(
@@ -995,7 +1122,7 @@ class H2HDBGalleriesInfos(
 ):
     def _create_galleries_infos_view(self) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         CREATE VIEW IF NOT EXISTS galleries_infos AS
@@ -1021,7 +1148,7 @@ class H2HDBGalleriesInfos(
             self.logger.info("galleries_infos view created.")
 
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         CREATE VIEW IF NOT EXISTS duplicate_hash_in_gallery AS WITH Files AS (
@@ -1070,7 +1197,7 @@ class H2HDBGalleriesComments(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta
     def _create_galleries_comments_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_comments"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -1086,21 +1213,10 @@ class H2HDBGalleriesComments(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def _insert_gallery_comment(self, db_gallery_id: int, comment: str) -> None:
-        if comment != "":
-            with self.SQLConnector() as connector:
-                table_name = "galleries_comments"
-                match self.config.database.sql_type.lower():
-                    case "mysql":
-                        insert_query = f"""
-                            INSERT INTO {table_name} (db_gallery_id, comment) VALUES (%s, %s)
-                        """
-                connector.execute(insert_query, (db_gallery_id, comment))
-
     def _update_gallery_comment(self, db_gallery_id: int, comment: str) -> None:
         with self.SQLConnector() as connector:
             table_name = "galleries_comments"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     update_query = f"""
                         UPDATE {table_name} SET Comment = %s WHERE db_gallery_id = %s
@@ -1112,7 +1228,7 @@ class H2HDBGalleriesComments(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta
     ) -> tuple | None:
         with self.SQLConnector() as connector:
             table_name = "galleries_comments"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT Comment
@@ -1132,28 +1248,24 @@ class H2HDBGalleriesComments(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta
         db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
         return self._check_gallery_comment_by_db_gallery_id(db_gallery_id)
 
-    def _select_gallery_comment(self, db_gallery_id: int) -> str:
-        query_result = self.__get_gallery_comment_by_db_gallery_id(db_gallery_id)
-        if query_result is None:
+    def get_comment_by_gallery_name(self, gallery_name: str) -> str:
+        db_gallery_id, comment = self._get_db_gallery_id_and_value_by_gallery_name(
+            gallery_name, "galleries_comments", "comment"
+        )
+        if comment is None:
             msg = (
                 f"Uploader comment for gallery name ID {db_gallery_id} does not exist."
             )
             self.logger.error(msg)
             raise DatabaseKeyError(msg)
-        else:
-            comment = query_result[0]
-        return comment
-
-    def get_comment_by_gallery_name(self, gallery_name: str) -> str:
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
-        return self._select_gallery_comment(db_gallery_id)
+        return comment  # type: ignore
 
 
 class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_galleries_tags_table(self) -> None:
         with self.SQLConnector() as connector:
             tag_name_table_name = f"galleries_tags_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {tag_name_table_name} (
@@ -1165,7 +1277,7 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             self.logger.info(f"{tag_name_table_name} table created.")
 
             tag_value_table_name = f"galleries_tags_values"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {tag_value_table_name} (
@@ -1177,7 +1289,7 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             self.logger.info(f"{tag_value_table_name} table created.")
 
             tag_pairs_table_name = f"galleries_tag_pairs_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {tag_pairs_table_name} (
@@ -1199,7 +1311,7 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             self.logger.info(f"{tag_pairs_table_name} table created.")
 
             table_name = f"galleries_tags"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -1218,126 +1330,47 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             connector.execute(query)
             self.logger.info(f"{table_name} table created.")
 
-    def __get_db_tag_pair_id(self, tag_name: str, tag_value: str) -> tuple | None:
-        with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT db_tag_pair_id
-                        FROM galleries_tag_pairs_dbids
-                        WHERE tag_name = %s AND tag_value = %s
-                    """
-            query_result = connector.fetch_one(select_query, (tag_name, tag_value))
-        return query_result
-
-    def _check_db_tag_pair_id(self, tag_name: str, tag_value: str) -> bool:
-        query_result = self.__get_db_tag_pair_id(tag_name, tag_value)
-        return query_result is not None
-
-    def _get_db_tag_pair_id(self, tag_name: str, tag_value: str) -> int:
-        query_result = self.__get_db_tag_pair_id(tag_name, tag_value)
-        if query_result is None:
-            self.logger.debug(f"Tag '{tag_value}' does not exist.")
-            raise DatabaseKeyError(f"Tag '{tag_value}' does not exist.")
-        else:
-            db_tag_id = query_result[0]
-        return db_tag_id
-
-    def _check_gallery_tag_name(self, tag_name: str) -> bool:
-        with self.SQLConnector() as connector:
-            table_name = f"galleries_tags_names"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT tag_name
-                        FROM {table_name}
-                        WHERE tag_name = %s
-                    """
-            query_result = connector.fetch_one(select_query, (tag_name,))
-        return query_result is not None
-
-    def _check_gallery_tag_value(self, tag_value: str) -> bool:
-        with self.SQLConnector() as connector:
-            table_name = f"galleries_tags_values"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT tag_value
-                        FROM {table_name}
-                        WHERE tag_value = %s
-                    """
-            query_result = connector.fetch_one(select_query, (tag_value,))
-        return query_result is not None
-
     def _insert_tag_names(self, tag_names: list[str]) -> None:
         if len(tag_names) == 0:
             return
         with self.SQLConnector() as connector:
             table_name = f"galleries_tags_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    insert_query_header = f"""
-                        INSERT INTO {table_name} (tag_name)
+                    insert_query = f"""
+                        INSERT IGNORE INTO {table_name} (tag_name)
+                        VALUES {", ".join(["(%s)" for _ in tag_names])}
                     """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s)" for _ in tag_names])]
-                    )
-                    insert_query = f"{insert_query_header} {insert_query_values}"
-            try:
-                connector.execute(insert_query, tuple(tag_names))
-            except DatabaseDuplicateKeyError:
-                pass
-            except Exception as e:
-                raise e
+            connector.execute(insert_query, tuple(tag_names))
 
     def _insert_tag_values(self, tag_values: list[str]) -> None:
         if len(tag_values) == 0:
             return
         with self.SQLConnector() as connector:
             table_name = f"galleries_tags_values"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    insert_query_header = f"""
-                        INSERT INTO {table_name} (tag_value)
+                    insert_query = f"""
+                        INSERT IGNORE INTO {table_name} (tag_value)
+                        VALUES {", ".join(["(%s)" for _ in tag_values])}
                     """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s)" for _ in tag_values])]
-                    )
-                    insert_query = f"{insert_query_header} {insert_query_values}"
-            try:
-                connector.execute(insert_query, tuple(tag_values))
-            except DatabaseDuplicateKeyError:
-                pass
-            except Exception as e:
-                raise e
+            connector.execute(insert_query, tuple(tag_values))
 
     def _insert_tag_pairs_dbids(self, tags: list[TagInformation]) -> None:
         if len(tags) == 0:
             return
         with self.SQLConnector() as connector:
             tag_pairs_table_name = f"galleries_tag_pairs_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    insert_query_header = f"""
-                        INSERT INTO {tag_pairs_table_name} (tag_name, tag_value)
+                    insert_query = f"""
+                        INSERT IGNORE INTO {tag_pairs_table_name} (tag_name, tag_value)
+                        VALUES {", ".join(["(%s, %s)" for _ in tags])}
                     """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s, %s)" for _ in tags])]
-                    )
-                    insert_query = f"{insert_query_header} {insert_query_values}"
             parameter = list[str]()
             for tag in tags:
                 parameter.extend([tag.tag_name, tag.tag_value])
-            try:
-                connector.execute(insert_query, tuple(parameter))
-            except DatabaseDuplicateKeyError:
-                toinsert_db_tag_pair_id = list[TagInformation]()
-                for tag in tags:
-                    if not self._check_db_tag_pair_id(tag.tag_name, tag.tag_value):
-                        toinsert_db_tag_pair_id.append(tag)
-                self._insert_tag_pairs_dbids(toinsert_db_tag_pair_id)
-            except Exception as e:
-                raise e
+            connector.execute(insert_query, tuple(parameter))
 
     def _insert_gallery_tags(
         self, db_gallery_id: int, tags: list[TagInformation]
@@ -1345,52 +1378,43 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
         if len(tags) == 0:
             return
 
-        toinsert_db_tag_pair_id = list[TagInformation]()
+        # INSERT IGNORE below only skips the existing shared rows, which an
+        # upsert would lock for writing. It would also truncate over-long
+        # values instead of failing, so they are rejected here.
         for tag in tags:
-            if not self._check_db_tag_pair_id(tag.tag_name, tag.tag_value):
-                toinsert_db_tag_pair_id.append(tag)
-
-        toinsert_tag_name = list[str]()
-        toinsert_tag_value = list[str]()
-        for tag in toinsert_db_tag_pair_id:
-            if (tag.tag_name not in toinsert_tag_name) and (
-                not self._check_gallery_tag_name(tag.tag_name)
-            ):
-                toinsert_tag_name.append(tag.tag_name)
-            if (tag.tag_value not in toinsert_tag_value) and (
-                not self._check_gallery_tag_value(tag.tag_value)
-            ):
-                toinsert_tag_value.append(tag.tag_value)
-        self._insert_tag_names(toinsert_tag_name)
-        self._insert_tag_values(toinsert_tag_value)
+            for text in (tag.tag_name, tag.tag_value):
+                if len(text) > self.innodb_index_prefix_limit:
+                    raise ValueError(
+                        f"Tag '{text}' is longer than {self.innodb_index_prefix_limit} characters."
+                    )
 
-        self._insert_tag_pairs_dbids(toinsert_db_tag_pair_id)
+        # Sorted so that concurrent gallery transactions lock shared tag rows in
+        # the same order.
+        self._insert_tag_names(sorted(set(tag.tag_name for tag in tags)))
+        self._insert_tag_values(sorted(set(tag.tag_value for tag in tags)))
+        self._insert_tag_pairs_dbids(
+            sorted(tags, key=lambda x: (x.tag_name, x.tag_value))
+        )
 
-        db_tag_pair_ids = list[int]()
-        for tag in tags:
-            db_tag_pair_ids.append(
-                self._get_db_tag_pair_id(tag.tag_name, tag.tag_value)
-            )
         with self.SQLConnector() as connector:
             table_name = f"galleries_tags"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    insert_query_header = f"""
+                    insert_query = f"""
                         INSERT INTO {table_name} (db_gallery_id, db_tag_pair_id)
+                        SELECT %s, db_tag_pair_id
+                        FROM galleries_tag_pairs_dbids
+                        WHERE (tag_name, tag_value) IN ({", ".join(["(%s, %s)" for _ in tags])})
                     """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s, %s)" for _ in db_tag_pair_ids])]
-                    )
-                    insert_query = f"{insert_query_header} {insert_query_values}"
-            parameter = list[int]()
-            for db_tag_pair_id in db_tag_pair_ids:
-                parameter.extend([db_gallery_id, db_tag_pair_id])
+            parameter = list[int | str]([db_gallery_id])
+            for tag in tags:
+                parameter.extend([tag.tag_name, tag.tag_value])
             connector.execute(insert_query, tuple(parameter))
 
     def _select_gallery_tag(self, db_gallery_id: int, tag_name: str) -> str:
         with self.SQLConnector() as connector:
             table_name = f"galleries_tags_{tag_name}"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT tag
@@ -1423,7 +1447,7 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _get_db_tag_pair_id_by_db_gallery_id(self, db_gallery_id: int) -> list[int]:
         with self.SQLConnector() as connector:
             table_name = "galleries_tags"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT db_tag_pair_id
@@ -1436,7 +1460,7 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _get_tag_pairs_by_db_tag_pair_id(self, db_tag_pair_id: int) -> tuple[str, str]:
         with self.SQLConnector() as connector:
             table_name = "galleries_tag_pairs_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT tag_name, tag_value
@@ -1454,15 +1478,29 @@ class H2HDBGalleriesTags(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
 
 
 class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
+    def _drop_full_name_fulltext_index(self, table_name: str) -> None:
+        # Names are only ever looked up by their parts or digest, never searched
+        # as text, so the full-text index was pure write cost on every insert.
+        # Tables created before it was removed have it dropped in place.
+        with self.SQLConnector() as connector:
+            match self.sql_type:
+                case "mysql":
+                    index_query = f"""
+                        SHOW INDEX FROM {table_name} WHERE Key_name = 'full_name'
+                    """
+                    drop_query = f"""
+                        ALTER TABLE {table_name} DROP INDEX full_name
+                    """
+            if connector.fetch_one(index_query) is not None:
+                connector.execute(drop_query)
+
     def _create_files_names_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = f"files_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    column_name = "name"
-                    column_name_parts, create_gallery_name_parts_sql = (
-                        self.mysql_split_file_name_based_on_limit(column_name)
-                    )
+                    column_name_parts = MYSQL_FILE_NAME_PARTS
+                    create_gallery_name_parts_sql = MYSQL_FILE_NAME_PARTS_DDL
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
                             PRIMARY KEY (db_file_id),
@@ -1480,7 +1518,7 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             self.logger.info(f"{table_name} table created.")
 
             table_name = f"files_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -1489,19 +1527,84 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
                                 ON UPDATE CASCADE
                                 ON DELETE CASCADE,
                             db_file_id  INT UNSIGNED NOT NULL,
-                            full_name   TEXT         NOT NULL,
-                            FULLTEXT (full_name)
+                            full_name   TEXT         NOT NULL
                         )
                     """
             connector.execute(query)
+            self._drop_full_name_fulltext_index(table_name)
             self.logger.info(f"{table_name} table created.")
 
+            table_name = f"files_stats"
+            match self.sql_type:
+                case "mysql":
+                    query = f"""
+                        CREATE TABLE IF NOT EXISTS {table_name} (
+                            PRIMARY KEY (db_file_id),
+                            FOREIGN KEY (db_file_id) REFERENCES files_dbids(db_file_id)
+                                ON UPDATE CASCADE
+                                ON DELETE CASCADE,
+                            db_file_id  INT UNSIGNED    NOT NULL,
+                            size        BIGINT UNSIGNED NOT NULL,
+                            mtime_ns    BIGINT          NOT NULL
+                        )
+                    """
+            connector.execute(query)
+            self.logger.info(f"{table_name} table created.")
+
+    @cached_property
+    def _insert_db_file_ids_query(self) -> str:
+        # Only the number of rows differs between galleries; they are
+        # substituted for '{values}' at insert time.
+        table_name = "files_dbids"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_FILE_NAME_PARTS
+                insert_query = f"""
+                    INSERT INTO {table_name}
+                        (db_gallery_id, {", ".join(column_name_parts)})
+                    VALUES {{values}}
+                """
+        return insert_query
+
+    @cached_property
+    def _insert_db_file_ids_row(self) -> str:
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_FILE_NAME_PARTS
+                row = f"(%s, {", ".join(["%s" for _ in column_name_parts])})"
+        return row
+
+    @cached_property
+    def _select_db_file_ids_query(self) -> str:
+        table_name = "files_dbids"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_FILE_NAME_PARTS
+                select_query = f"""
+                    SELECT db_file_id, {", ".join(column_name_parts)}
+                    FROM {table_name}
+                    WHERE db_gallery_id = %s
+                """
+        return select_query
+
+    @cached_property
+    def _insert_file_names_query(self) -> str:
+        table_name = "files_names"
+        match self.sql_type:
+            case "mysql":
+                insert_query = f"""
+                    INSERT INTO {table_name}
+                        (db_file_id, full_name)
+                    VALUES {{values}}
+                """
+        return insert_query
+
     def _insert_gallery_files(
         self, db_gallery_id: int, file_names_list: list[str]
-    ) -> None:
+    ) -> list[int]:
         with self.SQLConnector() as connector:
 
-            file_name_parts_list = list[list[str]]()
+            file_name_parts_list = list[tuple[str, ...]]()
             for file_name in file_names_list:
                 if len(file_name) > FILE_NAME_LENGTH_LIMIT:
                     self.logger.error(
@@ -1510,111 +1613,87 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
                     raise ValueError("File name is too long.")
                 file_name_parts_list.append(self._split_gallery_name(file_name))
 
-            table_name = "files_dbids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_file_name_based_on_limit(
-                        "name"
-                    )
-                    insert_query_header = f"""
-                        INSERT INTO {table_name}
-                            (db_gallery_id, {", ".join(column_name_parts)})
-                    """  # VALUES (%s, {", ".join(["%s" for _ in column_name_parts])})
-                    insert_query_values = " ".join(
-                        [
-                            "VALUES",
-                            ", ".join(
-                                [
-                                    f"(%s, {", ".join(["%s"   for _ in column_name_parts])})"
-                                    for _ in file_names_list
-                                ]
-                            ),
+            # Large galleries are written in several statements, so that no
+            # single one grows past what the server accepts in a packet.
+            for file_name_parts_chunk in chunk_list(
+                file_name_parts_list, MULTI_ROW_INSERT_SIZE
+            ):
+                insert_parameter = tuple(
+                    chain(
+                        *[
+                            (db_gallery_id, *file_name_parts)
+                            for file_name_parts in file_name_parts_chunk
                         ]
                     )
-                    insert_query = f"{insert_query_header} {insert_query_values}"
-            insert_parameter = tuple(
-                chain(
-                    *[
-                        (db_gallery_id, *file_name_parts_list[n])
-                        for n in range(len(file_name_parts_list))
-                    ]
                 )
-            )
-            connector.execute(
-                insert_query,
-                insert_parameter,
-            )
+                connector.execute(
+                    self._insert_db_file_ids_query.format(
+                        values=", ".join(
+                            [
+                                self._insert_db_file_ids_row
+                                for _ in file_name_parts_chunk
+                            ]
+                        )
+                    ),
+                    insert_parameter,
+                )
 
+            # The gallery's files were all inserted above, so their IDs are read
+            # back in one query instead of one query per file. CHAR columns drop
+            # trailing spaces, so the parts are matched without them.
+            db_file_id_by_name_parts = {
+                tuple(part.rstrip(" ") for part in query_result[1:]): query_result[0]
+                for query_result in connector.fetch_all(
+                    self._select_db_file_ids_query, (db_gallery_id,)
+                )
+            }
             db_file_id_list = [
-                self._get_db_file_id(db_gallery_id, file_name)
-                for file_name in file_names_list
+                db_file_id_by_name_parts[
+                    tuple(part.rstrip(" ") for part in file_name_parts)
+                ]
+                for file_name_parts in file_name_parts_list
             ]
 
-            table_name = "files_names"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_file_name_based_on_limit(
-                        "name"
-                    )
-                    insert_query_header = f"""
-                        INSERT INTO {table_name}
-                            (db_file_id, full_name)
-                    """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s, %s)" for _ in file_names_list])]
-                    )
-            insert_query = f"{insert_query_header} {insert_query_values}"
+            for file_names_chunk in chunk_list(
+                list(zip(db_file_id_list, file_names_list)), MULTI_ROW_INSERT_SIZE
+            ):
+                connector.execute(
+                    self._insert_file_names_query.format(
+                        values=", ".join(["(%s, %s)" for _ in file_names_chunk])
+                    ),
+                    tuple(chain(*file_names_chunk)),
+                )
+        return db_file_id_list
 
-            connector.execute(
-                insert_query,
-                tuple(
-                    chain(
-                        *[
-                            (db_file_id_list[n], file_names_list[n])
-                            for n in range(len(file_names_list))
-                        ]
-                    )
-                ),
-            )
+    def _insert_gallery_file_stats(
+        self, db_file_ids: list[int], file_stats: list[os.stat_result]
+    ) -> None:
+        if len(db_file_ids) == 0:
+            return
+        data = [
+            (db_file_id, file_stat.st_size, file_stat.st_mtime_ns)
+            for db_file_id, file_stat in zip(db_file_ids, file_stats)
+        ]
 
-    def __get_db_file_id(self, db_gallery_id: int, file_name: str) -> tuple | None:
         with self.SQLConnector() as connector:
-            table_name = "files_dbids"
-            file_name_parts = self._split_gallery_name(file_name)
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_file_name_based_on_limit(
-                        "name"
-                    )
-                    select_query = f"""
-                        SELECT db_file_id
-                        FROM {table_name}
-                        WHERE db_gallery_id = %s
-                        AND {" AND ".join([f"{part} = %s" for part in column_name_parts])}
-                    """
-            data = (db_gallery_id, *file_name_parts)
-            query_result = connector.fetch_one(select_query, data)
-        return query_result
-
-    def _check_db_file_id(self, db_gallery_id: int, file_name: str) -> bool:
-        query_result = self.__get_db_file_id(db_gallery_id, file_name)
-        return query_result is not None
-
-    def _get_db_file_id(self, db_gallery_id: int, file_name: str) -> int:
-        query_result = self.__get_db_file_id(db_gallery_id, file_name)
-        if query_result is None:
-            msg = f"Image ID for gallery name ID {db_gallery_id} and file '{file_name}' does not exist."
-            self.logger.error(msg)
-            raise DatabaseKeyError(msg)
-        else:
-            gallery_image_id = query_result[0]
-        return gallery_image_id
+            table_name = "files_stats"
+            for data_chunk in chunk_list(data, MULTI_ROW_INSERT_SIZE):
+                match self.sql_type:
+                    case "mysql":
+                        insert_query = f"""
+                            INSERT INTO {table_name} (db_file_id, size, mtime_ns)
+                            VALUES {", ".join(["(%s, %s, %s)" for _ in data_chunk])}
+                            ON DUPLICATE KEY UPDATE
+                                size = VALUES(size),
+                                mtime_ns = VALUES(mtime_ns)
+                        """
+                connector.execute(insert_query, tuple(chain(*data_chunk)))
 
     def get_files_by_gallery_name(self, gallery_name: str) -> list[str]:
         with self.SQLConnector() as connector:
             db_gallery_id = self._get_db_gallery_id_by_gallery_name(gallery_name)
             table_name = "files_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT full_name
@@ -1635,13 +1714,13 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     ) -> None:
         with self.SQLConnector() as connector:
             dbids_table_name = "files_hashs_%s_dbids" % algorithm.lower()
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {dbids_table_name} (
                             PRIMARY KEY (db_hash_id),
                             db_hash_id INT UNSIGNED AUTO_INCREMENT,
-                            hash_value BINARY({output_bits/8}) NOT NULL,
+                            hash_value BINARY({output_bits // 8}) NOT NULL,
                             UNIQUE (hash_value)
                         )
                     """
@@ -1649,7 +1728,7 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             self.logger.info(f"{dbids_table_name} table created.")
 
             table_name = "files_hashs_%s" % algorithm.lower()
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -1669,14 +1748,16 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
 
     def _create_galleries_files_hashs_tables(self) -> None:
         self.logger.debug("Creating gallery image hash tables...")
-        for algorithm, output_bits in HASH_ALGORITHMS.items():
-            self._create_galleries_files_hashs_table(algorithm, output_bits)
+        for algorithm in self.config.h2h.hash_algorithms:
+            self._create_galleries_files_hashs_table(
+                algorithm, HASH_ALGORITHMS[algorithm]
+            )
         self.logger.info("Gallery image hash tables created.")
 
     def _create_gallery_image_hash_view(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "files_hashs"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE VIEW IF NOT EXISTS {table_name} AS
@@ -1698,7 +1779,7 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _check_files_dbids_by_db_gallery_id(self, db_gallery_id: int) -> tuple | None:
         with self.SQLConnector() as connector:
             table_name = f"files_dbids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT COUNT(*)
@@ -1708,254 +1789,254 @@ class H2HDBFiles(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
             query_result = connector.fetch_one(select_query, (db_gallery_id,))
         return query_result[0] != 0
 
-    def _insert_gallery_file_hash_for_db_gallery_id(
-        self, fileinformations: list[FileInformation]
+    def _hash_gallery_files(
+        self,
+        absolute_file_paths: list[str],
+        file_sizes: list[int],
+        known_digests: dict[str, dict[str, bytes]],
     ) -> None:
-        algorithmlist = list(HASH_ALGORITHMS.keys())
-        for algorithm in algorithmlist:
-            toinsert = list[bytes]()
-            for n in range(len(fileinformations)):
-                fileinformations[n].sethash()
-                filehash = getattr(fileinformations[n], algorithm)
-                if filehash in toinsert:
-                    continue
-                else:
-                    if not self._check_db_hash_id_by_hash_value(filehash, algorithm):
-                        toinsert.append(filehash)
-            if len(toinsert) > 0:
-                self.insert_db_hash_id_by_hash_values(toinsert, algorithm)
-            for n in range(len(fileinformations)):
-                fileinformations[n].setdb_hash_id(
-                    algorithm,
-                    self.get_db_hash_id_by_hash_value(
-                        getattr(fileinformations[n], algorithm), algorithm
-                    ),
-                )
-        self.insert_hash_value_by_db_hash_ids(fileinformations)
+        algorithmlist = self.config.h2h.hash_algorithms
+        # hashlib releases the GIL while hashing, so files are hashed concurrently.
+        # Largest files are scheduled first to keep the workers evenly loaded.
+        tohash_file_paths = [
+            absolute_file_paths[n]
+            for n in sorted(
+                range(len(absolute_file_paths)),
+                key=lambda n: file_sizes[n],
+                reverse=True,
+            )
+            if absolute_file_paths[n] not in known_digests
+        ]
+        pending_digests = submit_in_threads(
+            hash_functions_by_file,
+            [(file_path, algorithmlist) for file_path in tohash_file_paths],
+        )
+        try:
+            for file_path, pending_digest in zip(tohash_file_paths, pending_digests):
+                known_digests[file_path] = pending_digest.result()
+        finally:
+            # Hashes still queued when one of them fails are no longer needed.
+            for pending_digest in pending_digests:
+                pending_digest.cancel()
 
-    def _insert_gallery_file_hash(
-        self, db_file_id: int, absolute_file_path: str
+    def _insert_gallery_file_hash_for_db_gallery_id(
+        self,
+        db_file_ids: list[int],
+        absolute_file_paths: list[str],
+        known_digests: dict[str, dict[str, bytes]],
     ) -> None:
+        algorithmlist = self.config.h2h.hash_algorithms
+        digests = [known_digests[file_path] for file_path in absolute_file_paths]
 
-        algorithmlist = list(HASH_ALGORITHMS.keys())
-        shuffle(algorithmlist)
         for algorithm in algorithmlist:
-            is_insert = False
-            current_hash_value = hash_function_by_file(absolute_file_path, algorithm)
-            if self._check_hash_value_by_file_id(db_file_id, algorithm):
-                original_hash_value = self.get_hash_value_by_file_id(
-                    db_file_id, algorithm
-                )
-                if original_hash_value != current_hash_value:
-                    if self._check_db_hash_id_by_hash_value(
-                        current_hash_value, algorithm
-                    ):
-                        db_hash_id = self.get_db_hash_id_by_hash_value(
-                            current_hash_value, algorithm
-                        )
-                        self._update_gallery_file_hash_by_db_hash_id(
-                            db_file_id, db_hash_id, algorithm
-                        )
-                    else:
-                        is_insert |= True
-            else:
-                is_insert |= True
-
-            if is_insert:
-                if self._check_db_hash_id_by_hash_value(current_hash_value, algorithm):
-                    db_hash_id = self.get_db_hash_id_by_hash_value(
-                        current_hash_value, algorithm
-                    )
-                else:
-                    with self.SQLConnector() as connector:
-                        table_name = f"files_hashs_{algorithm.lower()}_dbids"
-                        match self.config.database.sql_type.lower():
-                            case "mysql":
-                                insert_hash_value_query = f"""
-                                    INSERT INTO {table_name} (hash_value) VALUES (%s)
-                                """
-                        try:
-                            connector.execute(
-                                insert_hash_value_query, (current_hash_value,)
-                            )
-                        except DatabaseDuplicateKeyError:
-                            self.logger.warning(
-                                f"Hash value {current_hash_value!r} already exists in the database."
-                            )
-                        except Exception as e:
-                            raise e
-                    db_hash_id = self.get_db_hash_id_by_hash_value(
-                        current_hash_value, algorithm
-                    )
+            hash_values = [digest[algorithm] for digest in digests]
+            # Sorted so that concurrent gallery transactions lock shared hash
+            # rows in the same order.
+            self.insert_db_hash_id_by_hash_values(
+                sorted(set(hash_values)), algorithm
+            )
+            self.insert_hash_value_by_hash_values(db_file_ids, hash_values, algorithm)
 
-                with self.SQLConnector() as connector:
+    @cached_property
+    def _insert_hash_value_queries(self) -> dict[str, str]:
+        # Only the rows of new hashes differ between galleries; they are
+        # substituted for '{new_hashs}' at insert time.
+        match self.sql_type:
+            case "mysql":
+                insert_queries = dict[str, str]()
+                for algorithm in self.config.h2h.hash_algorithms:
                     table_name = f"files_hashs_{algorithm.lower()}"
-                    match self.config.database.sql_type.lower():
-                        case "mysql":
-                            insert_db_hash_id_query = f"""
-                                INSERT INTO {table_name} (db_file_id, db_hash_id) VALUES (%s, %s)
-                            """
-                    connector.execute(insert_db_hash_id_query, (db_file_id, db_hash_id))
-
-    def __get_db_hash_id_by_hash_value(
-        self, hash_value: bytes, algorithm: str
-    ) -> tuple | None:
-        with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}_dbids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT db_hash_id
-                        FROM {table_name}
-                        WHERE hash_value = %s
+                    insert_queries[algorithm] = f"""
+                        INSERT INTO {table_name} (db_file_id, db_hash_id)
+                        SELECT new_hashs.db_file_id, {table_name}_dbids.db_hash_id
+                        FROM ({{new_hashs}}) AS new_hashs
+                        INNER JOIN {table_name}_dbids
+                            ON {table_name}_dbids.hash_value = new_hashs.hash_value
                     """
-            query_result = connector.fetch_one(select_query, (hash_value,))
-        return query_result
+        return insert_queries
 
-    def _check_db_hash_id_by_hash_value(
-        self, hash_value: bytes, algorithm: str
-    ) -> bool:
-        query_result = self.__get_db_hash_id_by_hash_value(hash_value, algorithm)
-        return query_result is not None
-
-    def get_db_hash_id_by_hash_value(self, hash_value: bytes, algorithm: str) -> int:
-        query_result = self.__get_db_hash_id_by_hash_value(hash_value, algorithm)
-        if query_result is None:
-            msg = f"Image hash for image ID {hash_value!r} does not exist."
-            raise DatabaseKeyError(msg)
-        else:
-            db_hash_id = query_result[0]
-        return db_hash_id
-
-    def insert_hash_value_by_db_hash_ids(
-        self, fileinformations: list[FileInformation]
+    def insert_hash_value_by_hash_values(
+        self, db_file_ids: list[int], hash_values: list[bytes], algorithm: str
     ) -> None:
-        algorithmlist = list(HASH_ALGORITHMS.keys())
-        for algorithm in algorithmlist:
-            with self.SQLConnector() as connector:
-                table_name = f"files_hashs_{algorithm.lower()}"
-                match self.config.database.sql_type.lower():
+        if len(db_file_ids) == 0:
+            return
+        # The hash IDs are resolved by the server in the same statement, so they
+        # are never read back to the client.
+        inserted_count = 0
+        with self.SQLConnector() as connector:
+            for new_hashs_chunk in chunk_list(
+                list(zip(db_file_ids, hash_values)), MULTI_ROW_INSERT_SIZE
+            ):
+                match self.sql_type:
                     case "mysql":
-                        insert_query_header = f"""
-                            INSERT INTO {table_name} (db_file_id, db_hash_id)
-                        """
-                        insert_query_values = " ".join(
+                        # The connector sends bytes without a character set
+                        # introducer, so the digests are marked as binary here;
+                        # otherwise the derived column would be utf8mb4 text.
+                        new_hashs = " UNION ALL ".join(
                             [
-                                "VALUES",
-                                ", ".join(["(%s, %s)" for _ in fileinformations]),
+                                "SELECT %s AS db_file_id, _binary %s AS hash_value"
+                                for _ in new_hashs_chunk
                             ]
                         )
-                insert_query = f"{insert_query_header} {insert_query_values}"
-                parameters = list[int]()
-                for fileinformation in fileinformations:
-                    parameters += [
-                        fileinformation.db_file_id,
-                        fileinformation.db_hash_id[algorithm],
-                    ]
-                connector.execute(insert_query, tuple(parameters))
+                insert_query = self._insert_hash_value_queries[algorithm].format(
+                    new_hashs=new_hashs
+                )
+                inserted_count += connector.execute_returning_rowcount(
+                    insert_query, tuple(chain(*new_hashs_chunk))
+                )
+        if inserted_count != len(db_file_ids):
+            msg = f"Image hashes for {len(db_file_ids) - inserted_count} images do not exist in 'files_hashs_{algorithm.lower()}_dbids'."
+            raise DatabaseKeyError(msg)
 
-    def insert_db_hash_id_by_hash_value(
-        self, hash_value: bytes, algorithm: str
-    ) -> None:
-        with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}_dbids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query = f"""
-                        INSERT INTO {table_name} (hash_value) VALUES (%s)
+    @cached_property
+    def _insert_db_hash_id_query_headers(self) -> dict[str, str]:
+        match self.sql_type:
+            case "mysql":
+                insert_query_headers = {
+                    algorithm: f"""
+                        INSERT IGNORE INTO files_hashs_{algorithm.lower()}_dbids (hash_value)
                     """
-            connector.execute(insert_query, (hash_value,))
+                    for algorithm in self.config.h2h.hash_algorithms
+                }
+        return insert_query_headers
 
     def insert_db_hash_id_by_hash_values(
         self, hash_values: list[bytes], algorithm: str
     ) -> None:
+        if len(hash_values) == 0:
+            return
+        insert_query_header = self._insert_db_hash_id_query_headers[algorithm]
         with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}_dbids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    insert_query_header = f"""
-                        INSERT INTO {table_name} (hash_value)
-                    """
-                    insert_query_values = " ".join(
-                        ["VALUES", ", ".join(["(%s)" for _ in hash_values])]
-                    )
-            insert_query = f"{insert_query_header} {insert_query_values}"
-            try:
-                connector.execute(insert_query, tuple(hash_values))
-            except DatabaseDuplicateKeyError:
-                toinsert = list[bytes]()
-                for hash_value in hash_values:
-                    if not self._check_db_hash_id_by_hash_value(hash_value, algorithm):
-                        toinsert.append(hash_value)
-                self.insert_db_hash_id_by_hash_values(toinsert, algorithm)
-            except Exception as e:
-                raise e
+            for hash_values_chunk in chunk_list(hash_values, MULTI_ROW_INSERT_SIZE):
+                match self.sql_type:
+                    case "mysql":
+                        insert_query_values = " ".join(
+                            ["VALUES", ", ".join(["(%s)" for _ in hash_values_chunk])]
+                        )
+                insert_query = f"{insert_query_header} {insert_query_values}"
+                connector.execute(insert_query, tuple(hash_values_chunk))
 
-    def get_hash_value_by_db_hash_id(self, db_hash_id: int, algorithm: str) -> bytes:
-        with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}_dbids"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    select_query = f"""
-                        SELECT hash_value
-                        FROM {table_name}
-                        WHERE db_hash_id = %s
-                    """
-            query_result = connector.fetch_one(select_query, (db_hash_id,))
-            if query_result is None:
-                msg = f"Image hash for image ID {db_hash_id} does not exist."
-                raise DatabaseKeyError(msg)
-            else:
-                hash_value = query_result[0]
-        return hash_value
+    @cached_property
+    def _select_file_hashs_and_stat_queries(self) -> dict[tuple[str, ...], str]:
+        return dict[tuple[str, ...], str]()
 
-    def __get_hash_value_by_file_id(
-        self, db_file_id: int, algorithm: str
+    def _get_file_hashs_and_stat_by_gallery_name_and_file_name(
+        self, gallery_name: str, file_name: str, algorithms: list[str]
     ) -> tuple | None:
-        with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}"
-            match self.config.database.sql_type.lower():
-                case "mysql":
+        # Runs once per scanned gallery; the statement only depends on the
+        # algorithms, so it is built once for each list of them.
+        algorithms_key = tuple(algorithms)
+        select_query = self._select_file_hashs_and_stat_queries.get(algorithms_key)
+        if select_query is None:
+            match self.sql_type:
+                case "mysql":
+                    file_column_name_parts = MYSQL_FILE_NAME_PARTS
+                    hash_tables = [
+                        f"files_hashs_{algorithm.lower()}" for algorithm in algorithms
+                    ]
                     select_query = f"""
-                        SELECT db_hash_id
-                        FROM {table_name}
-                        WHERE db_file_id = %s
+                        SELECT files_dbids.db_file_id,
+                            files_stats.size,
+                            files_stats.mtime_ns,
+                            {", ".join([f"{x}_dbids.hash_value" for x in hash_tables])}
+                        FROM galleries_names
+                        INNER JOIN files_dbids USING (db_gallery_id)
+                        LEFT JOIN files_stats
+                            ON files_stats.db_file_id = files_dbids.db_file_id
+                        {" ".join([f"""
+                        LEFT JOIN {x}
+                            ON {x}.db_file_id = files_dbids.db_file_id
+                        LEFT JOIN {x}_dbids
+                            ON {x}_dbids.db_hash_id = {x}.db_hash_id
+                        """ for x in hash_tables])}
+                        WHERE galleries_names.full_name_sha256 = %s
+                        AND {" AND ".join([f"files_dbids.{part} = %s" for part in file_column_name_parts])}
                     """
-            query_result = connector.fetch_one(select_query, (db_file_id,))
-        return query_result
+            self._select_file_hashs_and_stat_queries[algorithms_key] = select_query
 
-    def _check_hash_value_by_file_id(self, db_file_id: int, algorithm: str) -> bool:
-        query_result = self.__get_hash_value_by_file_id(db_file_id, algorithm)
-        return query_result is not None
+        with self.SQLConnector() as connector:
+            file_name_parts = self._split_gallery_name(file_name)
+            data = (sha256(gallery_name.encode("utf-8")).digest(), *file_name_parts)
+            query_result = connector.fetch_one(select_query, data)
+        return query_result
 
-    def get_hash_value_by_file_id(self, db_file_id: int, algorithm: str) -> bytes:
-        query_result = self.__get_hash_value_by_file_id(db_file_id, algorithm)
-        if query_result is None:
-            msg = f"Image hash for image ID {db_file_id} does not exist."
-            raise DatabaseKeyError(msg)
-        else:
-            db_hash_id = query_result[0]
+    @cached_property
+    def _select_files_hashs_and_stat_queries(self) -> dict[tuple[str, ...], str]:
+        return dict[tuple[str, ...], str]()
 
-        return self.get_hash_value_by_db_hash_id(db_hash_id, algorithm)
+    def _get_files_hashs_and_stat_by_gallery_name(
+        self, gallery_name: str, algorithms: list[str]
+    ) -> list[tuple]:
+        algorithms_key = tuple(algorithms)
+        select_query = self._select_files_hashs_and_stat_queries.get(algorithms_key)
+        if select_query is None:
+            match self.sql_type:
+                case "mysql":
+                    hash_tables = [
+                        f"files_hashs_{algorithm.lower()}" for algorithm in algorithms
+                    ]
+                    select_query = f"""
+                        SELECT files_names.full_name,
+                            files_stats.size,
+                            files_stats.mtime_ns,
+                            {", ".join([f"{x}_dbids.hash_value" for x in hash_tables])}
+                        FROM galleries_names
+                        INNER JOIN files_dbids USING (db_gallery_id)
+                        INNER JOIN files_names
+                            ON files_names.db_file_id = files_dbids.db_file_id
+                        INNER JOIN files_stats
+                            ON files_stats.db_file_id = files_dbids.db_file_id
+                        {" ".join([f"""
+                        LEFT JOIN {x}
+                            ON {x}.db_file_id = files_dbids.db_file_id
+                        LEFT JOIN {x}_dbids
+                            ON {x}_dbids.db_hash_id = {x}.db_hash_id
+                        """ for x in hash_tables])}
+                        WHERE galleries_names.full_name_sha256 = %s
+                    """
+            self._select_files_hashs_and_stat_queries[algorithms_key] = select_query
+
+        with self.SQLConnector() as connector:
+            data = (sha256(gallery_name.encode("utf-8")).digest(),)
+            query_result = connector.fetch_all(select_query, data)
+        return query_result
 
-    def _update_gallery_file_hash_by_db_hash_id(
-        self, db_file_id: int, db_hash_id: int, algorithm: str
+    def _get_unchanged_files_digests(
+        self,
+        galleryinfo_params: GalleryInfoParser,
+        known_digests: dict[str, dict[str, bytes]],
     ) -> None:
-        with self.SQLConnector() as connector:
-            table_name = f"files_hashs_{algorithm.lower()}"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    update_query = f"""
-                        UPDATE {table_name} SET db_hash_id = %s WHERE db_file_id = %s
-                    """
-            connector.execute(update_query, (db_hash_id, db_file_id))
+        # A gallery is reinserted as a whole when its info file changes, but
+        # its images rarely do. Files whose size and modification time still
+        # match the stored stats keep their stored digests instead of being
+        # read and hashed again.
+        algorithmlist = self.config.h2h.hash_algorithms
+        folder_prefix = os.path.join(galleryinfo_params.gallery_folder, "")
+        for file_name, size, mtime_ns, *hash_values in (
+            self._get_files_hashs_and_stat_by_gallery_name(
+                galleryinfo_params.gallery_name, algorithmlist
+            )
+        ):
+            if None in hash_values:
+                continue
+            absolute_file_path = folder_prefix + file_name
+            if absolute_file_path in known_digests:
+                continue
+            try:
+                file_stat = os.stat(absolute_file_path)
+            except FileNotFoundError:
+                continue
+            if (size, mtime_ns) == (file_stat.st_size, file_stat.st_mtime_ns):
+                known_digests[absolute_file_path] = dict(
+                    zip(algorithmlist, map(bytes, hash_values))
+                )
 
 
 class H2HDBRemovedGalleries(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta):
     def _create_removed_galleries_gids_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "removed_galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -1969,20 +2050,23 @@ class H2HDBRemovedGalleries(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta)
     def insert_removed_gallery_gid(self, gid: int) -> None:
         with self.SQLConnector() as connector:
             table_name = "removed_galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     insert_query = f"""
-                        INSERT INTO {table_name} (gid) VALUES (%s)
+                        INSERT IGNORE INTO {table_name} (gid) VALUES (%s)
                     """
-            if self._check_removed_gallery_gid(gid):
-                self.logger.warning(f"Removed gallery GID {gid} already exists.")
-            else:
-                connector.execute(insert_query, (gid,))
+            # The primary key rejects a GID that is already recorded, so no
+            # SELECT is needed to detect it.
+            inserted_count = connector.execute_returning_rowcount(
+                insert_query, (gid,)
+            )
+        if inserted_count == 0:
+            self.logger.warning(f"Removed gallery GID {gid} already exists.")
 
     def __get_removed_gallery_gid(self, gid: int) -> tuple | None:
         with self.SQLConnector() as connector:
             table_name = "removed_galleries_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT gid
@@ -1992,10 +2076,6 @@ class H2HDBRemovedGalleries(H2HDBGalleriesIDs, H2HDBAbstract, metaclass=ABCMeta)
             query_result = connector.fetch_one(select_query, (gid,))
         return query_result
 
-    def _check_removed_gallery_gid(self, gid: int) -> bool:
-        query_result = self.__get_removed_gallery_gid(gid)
-        return query_result is not None
-
     def select_removed_gallery_gid(self, gid: int) -> int:
         query_result = self.__get_removed_gallery_gid(gid)
         if query_result is None:
@@ -2018,27 +2098,25 @@ class H2HDB(
     def _create_pending_gallery_removals_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "pending_gallery_removals"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    column_name = "name"
-                    column_name_parts, create_gallery_name_parts_sql = (
-                        self.mysql_split_gallery_name_based_on_limit(column_name)
-                    )
+                    column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                    create_gallery_name_parts_sql = MYSQL_GALLERY_NAME_PARTS_DDL
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
                             PRIMARY KEY ({", ".join(column_name_parts)}),
                             {create_gallery_name_parts_sql},
-                            full_name TEXT NOT NULL,
-                            FULLTEXT (full_name)
+                            full_name TEXT NOT NULL
                         )
                     """
             connector.execute(query)
+            self._drop_full_name_fulltext_index(table_name)
             self.logger.info(f"{table_name} table created.")
 
     def _count_duplicated_files_hashs_sha512(self) -> int:
         with self.SQLConnector() as connector:
             table_name = "duplicated_files_hashs_sha512"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         SELECT COUNT(*)
@@ -2049,7 +2127,7 @@ class H2HDB(
 
     def _create_duplicated_galleries_tables(self) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         CREATE VIEW IF NOT EXISTS duplicated_files_hashs_sha512 AS 
@@ -2060,31 +2138,41 @@ class H2HDB(
                         """
             connector.execute(query)
 
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
+                    # The duplicated hash IDs are aggregated once and joined
+                    # straight to the files that carry them, instead of going
+                    # through the duplicated_files_hashs_sha512 view and back.
+                    # The artist filter rejects unmatched rows anyway, so inner
+                    # joins are used; files_dbids.db_gallery_id is a foreign key
+                    # to galleries_dbids, which therefore needs no join. Replaced
+                    # rather than skipped, so existing databases pick it up.
                     query = """
-                        CREATE VIEW IF NOT EXISTS duplicated_db_dbids AS 
+                        CREATE OR REPLACE VIEW duplicated_db_dbids AS
                             SELECT
-                                galleries_dbids.db_gallery_id AS db_gallery_id,
+                                files_dbids.db_gallery_id AS db_gallery_id,
                                 files_dbids.db_file_id AS db_file_id,
-                                duplicated_files_hashs_sha512.db_hash_id AS db_hash_id,
+                                files_hashs_sha512.db_hash_id AS db_hash_id,
                                 galleries_tag_pairs_dbids.tag_value AS artist_value
-                            FROM duplicated_files_hashs_sha512
-                            LEFT JOIN files_hashs_sha512
-                                ON duplicated_files_hashs_sha512.db_hash_id = files_hashs_sha512.db_hash_id
-                            LEFT JOIN files_dbids
+                            FROM (
+                                SELECT db_hash_id
+                                FROM files_hashs_sha512
+                                GROUP BY db_hash_id
+                                HAVING COUNT(*) >= 3
+                            ) AS duplicated_hashs
+                            INNER JOIN files_hashs_sha512
+                                ON duplicated_hashs.db_hash_id = files_hashs_sha512.db_hash_id
+                            INNER JOIN files_dbids
                                 ON files_hashs_sha512.db_file_id = files_dbids.db_file_id
-                            LEFT JOIN galleries_dbids
-                                ON files_dbids.db_gallery_id = galleries_dbids.db_gallery_id
-                            LEFT JOIN galleries_tags
-                                ON galleries_dbids.db_gallery_id = galleries_tags.db_gallery_id
-                            LEFT JOIN galleries_tag_pairs_dbids
+                            INNER JOIN galleries_tags
+                                ON files_dbids.db_gallery_id = galleries_tags.db_gallery_id
+                            INNER JOIN galleries_tag_pairs_dbids
                                 ON galleries_tags.db_tag_pair_id = galleries_tag_pairs_dbids.db_tag_pair_id
                             WHERE galleries_tag_pairs_dbids.tag_name = 'artist';
                         """
             connector.execute(query)
 
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         CREATE VIEW IF NOT EXISTS duplicated_count_artists_by_db_gallery_id AS
@@ -2096,7 +2184,7 @@ class H2HDB(
                         """
             connector.execute(query)
 
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         CREATE VIEW IF NOT EXISTS duplicated_hash_values_by_count_artist_ratio AS
@@ -2111,156 +2199,277 @@ class H2HDB(
                         """
             connector.execute(query)
 
+    @cached_property
+    def _insert_pending_gallery_removals_query(self) -> str:
+        table_name = "pending_gallery_removals"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                insert_query = f"""
+                    INSERT IGNORE INTO {table_name} ({", ".join(column_name_parts)}, full_name)
+                    VALUES {{values}}
+                """
+        return insert_query
+
+    @cached_property
+    def _insert_pending_gallery_removals_row(self) -> str:
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                row = f"({", ".join(["%s" for _ in column_name_parts])}, %s)"
+        return row
+
     def insert_pending_gallery_removal(self, gallery_name: str) -> None:
+        self.insert_pending_gallery_removals([gallery_name])
+
+    def insert_pending_gallery_removals(self, gallery_names: list[str]) -> None:
+        for gallery_name in gallery_names:
+            self._forget_db_gallery_id(gallery_name)
+            if len(gallery_name) > FOLDER_NAME_LENGTH_LIMIT:
+                self.logger.error(
+                    f"Gallery name '{gallery_name}' is too long. Must be {FOLDER_NAME_LENGTH_LIMIT} characters or less."
+                )
+                raise ValueError("Gallery name is too long.")
+        # A removal that is already pending is skipped by its primary key, so it
+        # is not looked up first. Many removals are written in a few statements.
         with self.SQLConnector() as connector:
-            if self.check_pending_gallery_removal(gallery_name) is False:
-                table_name = "pending_gallery_removals"
-                if len(gallery_name) > FOLDER_NAME_LENGTH_LIMIT:
-                    self.logger.error(
-                        f"Gallery name '{gallery_name}' is too long. Must be {FOLDER_NAME_LENGTH_LIMIT} characters or less."
+            for gallery_names_chunk in chunk_list(gallery_names, MULTI_ROW_INSERT_SIZE):
+                insert_parameter = tuple(
+                    chain(
+                        *[
+                            (*self._split_gallery_name(gallery_name), gallery_name)
+                            for gallery_name in gallery_names_chunk
+                        ]
                     )
-                    raise ValueError("Gallery name is too long.")
-                gallery_name_parts = self._split_gallery_name(gallery_name)
-
-                match self.config.database.sql_type.lower():
-                    case "mysql":
-                        column_name_parts, _ = (
-                            self.mysql_split_gallery_name_based_on_limit("name")
-                        )
-                        insert_query = f"""
-                            INSERT INTO {table_name} ({", ".join(column_name_parts)}, full_name)
-                            VALUES ({", ".join(["%s" for _ in column_name_parts])}, %s)
-                        """
+                )
                 connector.execute(
-                    insert_query, (*tuple(gallery_name_parts), gallery_name)
+                    self._insert_pending_gallery_removals_query.format(
+                        values=", ".join(
+                            [
+                                self._insert_pending_gallery_removals_row
+                                for _ in gallery_names_chunk
+                            ]
+                        )
+                    ),
+                    insert_parameter,
                 )
 
+    @cached_property
+    def _select_pending_gallery_removal_query(self) -> str:
+        table_name = "pending_gallery_removals"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                select_query = f"""
+                    SELECT full_name
+                    FROM {table_name}
+                    WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
+                """
+        return select_query
+
     def check_pending_gallery_removal(self, gallery_name: str) -> bool:
         with self.SQLConnector() as connector:
-            table_name = "pending_gallery_removals"
             gallery_name_parts = self._split_gallery_name(gallery_name)
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    select_query = f"""
-                        SELECT full_name
-                        FROM {table_name}
-                        WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
-                    """
-            query_result = connector.fetch_one(select_query, tuple(gallery_name_parts))
+            query_result = connector.fetch_one(
+                self._select_pending_gallery_removal_query,
+                tuple(gallery_name_parts),
+            )
             return query_result is not None
 
     def get_pending_gallery_removals(self) -> list[str]:
         with self.SQLConnector() as connector:
             table_name = "pending_gallery_removals"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT full_name
                         FROM {table_name}
                     """
 
-            query_result = connector.fetch_all(select_query)
-            pending_gallery_removals = [query[0] for query in query_result]
+            pending_gallery_removals = [
+                query[0] for query in connector.fetch_iter(select_query)
+            ]
         return pending_gallery_removals
 
+    @cached_property
+    def _delete_pending_gallery_removal_query(self) -> str:
+        table_name = "pending_gallery_removals"
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                delete_query = f"""
+                    DELETE FROM {table_name} WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
+                """
+        return delete_query
+
     def delete_pending_gallery_removal(self, gallery_name: str) -> None:
         with self.SQLConnector() as connector:
-            table_name = "pending_gallery_removals"
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    delete_query = f"""
-                        DELETE FROM {table_name} WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
-                    """
-
             gallery_name_parts = self._split_gallery_name(gallery_name)
-            connector.execute(delete_query, tuple(gallery_name_parts))
+            connector.execute(
+                self._delete_pending_gallery_removal_query,
+                tuple(gallery_name_parts),
+            )
+
+    @cached_property
+    def _gallery_name_parts_row(self) -> str:
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                row = f"({", ".join(["%s" for _ in column_name_parts])})"
+        return row
+
+    @cached_property
+    def _delete_galleries_queries(self) -> dict[str, str]:
+        table_names = ["galleries_dbids", "pending_gallery_removals"]
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                delete_queries = {
+                    table_name: f"""
+                        DELETE FROM {table_name}
+                        WHERE ({", ".join(column_name_parts)}) IN ({{values}})
+                    """
+                    for table_name in table_names
+                }
+        return delete_queries
+
+    def _delete_galleries_by_gallery_names(
+        self, table_name: str, gallery_names: list[str]
+    ) -> int:
+        # One statement per chunk of galleries instead of one per gallery.
+        deleted_count = 0
+        with self.SQLConnector() as connector:
+            for gallery_names_chunk in chunk_list(gallery_names, MULTI_ROW_INSERT_SIZE):
+                delete_parameter = tuple(
+                    chain(
+                        *[
+                            self._split_gallery_name(gallery_name)
+                            for gallery_name in gallery_names_chunk
+                        ]
+                    )
+                )
+                deleted_count += connector.execute_returning_rowcount(
+                    self._delete_galleries_queries[table_name].format(
+                        values=", ".join(
+                            [self._gallery_name_parts_row for _ in gallery_names_chunk]
+                        )
+                    ),
+                    delete_parameter,
+                )
+        return deleted_count
 
     def delete_pending_gallery_removals(self) -> None:
         pending_gallery_removals = self.get_pending_gallery_removals()
+        if len(pending_gallery_removals) == 0:
+            return
+        # Committed once for all removals; a failure leaves every removal
+        # pending, so it is retried on the next run.
+        with self.SQLConnector() as connector, connector.transaction():
+            for gallery_name in pending_gallery_removals:
+                self.delete_gallery_file(gallery_name)
+            deleted_count = self._delete_galleries_by_gallery_names(
+                "galleries_dbids", pending_gallery_removals
+            )
+            self._delete_galleries_by_gallery_names(
+                "pending_gallery_removals", pending_gallery_removals
+            )
         for gallery_name in pending_gallery_removals:
-            self.delete_gallery_file(gallery_name)
-            self.delete_gallery(gallery_name)
-            self.delete_pending_gallery_removal(gallery_name)
+            self._forget_db_gallery_id(gallery_name)
+        self.logger.info(
+            f"{deleted_count} of {len(pending_gallery_removals)} pending galleries deleted."
+        )
 
     def delete_gallery_file(self, gallery_name: str) -> None:
         # self.logger.info(f"Gallery images for '{gallery_name}' deleted.")
         pass
 
+    @cached_property
+    def _delete_gallery_query(self) -> str:
+        match self.sql_type:
+            case "mysql":
+                column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                delete_query = f"""
+                    DELETE FROM galleries_dbids
+                    WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
+                """
+        return delete_query
+
     def delete_gallery(self, gallery_name: str) -> None:
+        # The DELETE reports whether the gallery existed, so no SELECT is
+        # needed beforehand; new galleries are inserted after a delete too.
         with self.SQLConnector() as connector:
-            if not self._check_galleries_dbids_by_gallery_name(gallery_name):
-                self.logger.debug(f"Gallery '{gallery_name}' does not exist.")
-                return
-
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    get_delete_gallery_id_query = f"""
-                        DELETE FROM galleries_dbids
-                        WHERE {" AND ".join([f"{part} = %s" for part in column_name_parts])}
-                        """
-
             gallery_name_parts = self._split_gallery_name(gallery_name)
-            connector.execute(get_delete_gallery_id_query, tuple(gallery_name_parts))
+            deleted_count = connector.execute_returning_rowcount(
+                self._delete_gallery_query, tuple(gallery_name_parts)
+            )
+        self._forget_db_gallery_id(gallery_name)
+        if deleted_count == 0:
+            self.logger.debug("Gallery '%s' does not exist.", gallery_name)
+        else:
             self.logger.info(f"Gallery '{gallery_name}' deleted.")
 
     def optimize_database(self) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    select_table_name_query = f"""
-                        SELECT TABLE_NAME
+                    # A table with several foreign keys is listed once per
+                    # key, but must only be rebuilt once.
+                    select_table_name_query = """
+                        SELECT DISTINCT TABLE_NAME
                         FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-                        WHERE REFERENCED_TABLE_SCHEMA = '{self.config.database.database}'
+                        WHERE REFERENCED_TABLE_SCHEMA = %s
                     """
-            table_names = connector.fetch_all(select_table_name_query)
+            table_names = connector.fetch_all(
+                select_table_name_query, (self.config.database.database,)
+            )
             table_names = [t[0] for t in table_names]
 
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    get_optimize_query = lambda x: "OPTIMIZE TABLE {x}".format(x=x)
-
+        # The tables are rebuilt independently, each on its own connection.
+        with SQLThreadsList() as threads:
             for table_name in table_names:
-                connector.execute(get_optimize_query(table_name))
-            self.logger.info("Database optimized.")
+                threads.append(target=self._optimize_table, args=(table_name,))
+        self.logger.info("Database optimized.")
+
+    def _optimize_table(self, table_name: str) -> None:
+        with self.SQLConnector() as connector:
+            match self.sql_type:
+                case "mysql":
+                    optimize_query = f"OPTIMIZE TABLE {table_name}"
+            connector.execute(optimize_query)
 
     def _create_pending_download_gids_view(self) -> None:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
+                    # The bare time columns are compared against constants,
+                    # so the redownload and upload filters can use the index
+                    # on time instead of computing DATE_ADD for every row.
+                    # Replaced rather than skipped, so existing databases pick
+                    # up the new definition.
                     query = """
-                        CREATE VIEW IF NOT EXISTS pending_download_gids AS
+                        CREATE OR REPLACE VIEW pending_download_gids AS
                             SELECT gids.gid AS gid
-                            FROM (SELECT *
-                                FROM galleries_redownload_times AS grt0
-                                WHERE DATE_ADD(grt0.time, INTERVAL 7 DAY) <= NOW()
-                                )
-                                AS grt
+                            FROM galleries_redownload_times AS grt
                             INNER JOIN galleries_download_times AS gdt
-                                on grt.db_gallery_id = gdt.db_gallery_id
+                                ON grt.db_gallery_id = gdt.db_gallery_id
                             INNER JOIN galleries_upload_times AS gut
                                 ON grt.db_gallery_id = gut.db_gallery_id
                             INNER JOIN galleries_gids AS gids
                                 ON grt.db_gallery_id = gids.db_gallery_id
-                            WHERE grt.time <= DATE_ADD(gut.time, INTERVAL 1 YEAR)
-                                AND DATE_ADD(gut.time, INTERVAL 7 DAY) <= NOW()
-                                OR DATE_ADD(gdt.time, INTERVAL 7 DAY) <= grt.time
-                                 ORDER BY gut.`time` DESC
+                            WHERE grt.time <= NOW() - INTERVAL 7 DAY
+                                AND (
+                                    grt.time <= gut.time + INTERVAL 1 YEAR
+                                    AND gut.time <= NOW() - INTERVAL 7 DAY
+                                    OR gdt.time <= grt.time - INTERVAL 7 DAY
+                                )
+                            ORDER BY gut.`time` DESC
                     """
             connector.execute(query)
             self.logger.info("pending_download_gids view created.")
 
     def get_pending_download_gids(self) -> list[int]:
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = """
                         SELECT gid
@@ -2273,7 +2482,7 @@ class H2HDB(
     def _create_todelete_gids_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "todelete_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -2289,7 +2498,7 @@ class H2HDB(
 
         with self.SQLConnector() as connector:
             table_name = "todelete_names"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE VIEW IF NOT EXISTS {table_name} AS
@@ -2305,7 +2514,7 @@ class H2HDB(
     def check_todelete_gid(self, gid: int) -> bool:
         with self.SQLConnector() as connector:
             table_name = "todelete_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT gid
@@ -2316,20 +2525,30 @@ class H2HDB(
         return query_result is not None
 
     def insert_todelete_gid(self, gid: int) -> None:
-        if not self.check_todelete_gid(gid):
-            with self.SQLConnector() as connector:
-                table_name = "todelete_gids"
-                match self.config.database.sql_type.lower():
-                    case "mysql":
-                        insert_query = f"""
-                            INSERT INTO {table_name} (gid) VALUES (%s)
-                        """
-                connector.execute(insert_query, (gid,))
+        self.insert_todelete_gids([gid])
+
+    def insert_todelete_gids(self, gids: list[int]) -> None:
+        # GIDs that are already queued are kept by the no-op update instead of
+        # being looked up one by one. Unlike INSERT IGNORE, this still rejects
+        # GIDs that are unknown to galleries_gids.
+        with self.SQLConnector() as connector:
+            table_name = "todelete_gids"
+            match self.sql_type:
+                case "mysql":
+                    insert_query = f"""
+                        INSERT INTO {table_name} (gid) VALUES {{values}}
+                        ON DUPLICATE KEY UPDATE gid = gid
+                    """
+            for gids_chunk in chunk_list(sorted(set(gids)), MULTI_ROW_INSERT_SIZE):
+                connector.execute(
+                    insert_query.format(values=", ".join(["(%s)" for _ in gids_chunk])),
+                    tuple(gids_chunk),
+                )
 
     def _create_todownload_gids_table(self) -> None:
         with self.SQLConnector() as connector:
             table_name = "todownload_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     query = f"""
                         CREATE TABLE IF NOT EXISTS {table_name} (
@@ -2344,7 +2563,7 @@ class H2HDB(
     def check_todownload_gid(self, gid: int, url: str) -> bool:
         with self.SQLConnector() as connector:
             table_name = "todownload_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     if url != "":
                         select_query = f"""
@@ -2373,23 +2592,23 @@ class H2HDB(
         elif gid <= 0:
             raise ValueError("Gallery GID must be greater than zero.")
 
-        if not self.check_todownload_gid(gid, url):
-            if (url == "") or (not self.check_todownload_gid(gid, "")):
-                with self.SQLConnector() as connector:
-                    table_name = "todownload_gids"
-                    match self.config.database.sql_type.lower():
-                        case "mysql":
-                            insert_query = f"""
-                                INSERT INTO {table_name} (gid, url) VALUES (%s, %s)
-                            """
-                    connector.execute(insert_query, (gid, url))
-            else:
-                self.update_todownload_gid(gid, url)
+        # A queued GID keeps its row; only a non-empty URL replaces the stored
+        # one. Done in one statement instead of looking the GID up first.
+        with self.SQLConnector() as connector:
+            table_name = "todownload_gids"
+            match self.sql_type:
+                case "mysql":
+                    insert_query = f"""
+                        INSERT INTO {table_name} (gid, url) VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE
+                            url = IF(VALUES(url) <> '', VALUES(url), url)
+                    """
+            connector.execute(insert_query, (gid, url))
 
     def update_todownload_gid(self, gid: int, url: str) -> None:
         with self.SQLConnector() as connector:
             table_name = "todownload_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     update_query = f"""
                         UPDATE {table_name} SET url = %s WHERE gid = %s
@@ -2399,7 +2618,7 @@ class H2HDB(
     def remove_todownload_gid(self, gid: int) -> None:
         with self.SQLConnector() as connector:
             table_name = "todownload_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     delete_query = f"""
                         DELETE FROM {table_name} WHERE gid = %s
@@ -2409,7 +2628,7 @@ class H2HDB(
     def get_todownload_gids(self) -> list[tuple[int, str]]:
         with self.SQLConnector() as connector:
             table_name = "todownload_gids"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT gid, url
@@ -2442,139 +2661,227 @@ class H2HDB(
         self._create_removed_galleries_gids_table()
         self._create_galleries_tags_table()
         self._create_duplicated_galleries_tables()
+        self._create_insert_gallery_infos_procedure()
         self.logger.info("Main tables created.")
 
+    def _create_insert_gallery_infos_procedure(self) -> None:
+        with self.SQLConnector() as connector:
+            match self.sql_type:
+                case "mysql":
+                    query = f"""
+                        CREATE OR REPLACE PROCEDURE insert_gallery_infos (
+                            IN in_db_gallery_id  INT UNSIGNED,
+                            IN in_gid            INT UNSIGNED,
+                            IN in_title          TEXT,
+                            IN in_upload_time    DATETIME,
+                            IN in_comment        TEXT,
+                            IN in_upload_account CHAR({self.innodb_index_prefix_limit}),
+                            IN in_download_time  DATETIME,
+                            IN in_modified_time  DATETIME
+                        )
+                        BEGIN
+                            INSERT INTO galleries_gids (db_gallery_id, gid)
+                                VALUES (in_db_gallery_id, in_gid);
+                            INSERT INTO galleries_titles (db_gallery_id, title)
+                                VALUES (in_db_gallery_id, in_title);
+                            INSERT INTO galleries_upload_times (db_gallery_id, time)
+                                VALUES (in_db_gallery_id, in_upload_time);
+                            IF in_comment <> '' THEN
+                                INSERT INTO galleries_comments (db_gallery_id, comment)
+                                    VALUES (in_db_gallery_id, in_comment);
+                            END IF;
+                            INSERT INTO galleries_upload_accounts (db_gallery_id, account)
+                                VALUES (in_db_gallery_id, in_upload_account);
+                            INSERT INTO galleries_download_times (db_gallery_id, time)
+                                VALUES (in_db_gallery_id, in_download_time);
+                            INSERT INTO galleries_redownload_times (db_gallery_id, time)
+                                VALUES (in_db_gallery_id, in_download_time);
+                            INSERT INTO galleries_access_times (db_gallery_id, time)
+                                VALUES (in_db_gallery_id, in_download_time);
+                            INSERT INTO galleries_modified_times (db_gallery_id, time)
+                                VALUES (in_db_gallery_id, in_modified_time);
+                        END
+                    """
+            connector.execute(query)
+            self.logger.info("insert_gallery_infos procedure created.")
+
+    def _insert_gallery_infos(
+        self, db_gallery_id: int, galleryinfo_params: GalleryInfoParser
+    ) -> None:
+        # One CALL writes the gid, title, comment, upload account and time rows,
+        # instead of one statement and round trip per table.
+        with self.SQLConnector() as connector:
+            match self.sql_type:
+                case "mysql":
+                    call_query = """
+                        CALL insert_gallery_infos (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """
+            connector.execute(
+                call_query,
+                (
+                    db_gallery_id,
+                    galleryinfo_params.gid,
+                    galleryinfo_params.title,
+                    galleryinfo_params.upload_time,
+                    galleryinfo_params.galleries_comments,
+                    galleryinfo_params.upload_account,
+                    galleryinfo_params.download_time,
+                    galleryinfo_params.modified_time,
+                ),
+            )
+
     def update_redownload_time_to_now_by_gid(self, gid: int) -> None:
         db_gallery_id = self._get_db_gallery_id_by_gid(gid)
         table_name = "galleries_redownload_times"
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     update_query = f"""
                         UPDATE {table_name} SET time = NOW() WHERE db_gallery_id = %s
                     """
             connector.execute(update_query, (db_gallery_id,))
 
-    def _insert_gallery_info(self, galleryinfo_params: GalleryInfoParser) -> None:
+    def _insert_gallery_info(
+        self,
+        galleryinfo_params: GalleryInfoParser,
+        absolute_file_paths: list[str],
+        file_stats: list[os.stat_result],
+        known_digests: dict[str, dict[str, bytes]],
+    ) -> None:
         self.insert_pending_gallery_removal(galleryinfo_params.gallery_name)
 
-        self._insert_gallery_name(galleryinfo_params.gallery_name)
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(
-            galleryinfo_params.gallery_name
-        )
-
-        with SQLThreadsList() as threads:
-            threads.append(
-                target=self._insert_gallery_gid,
-                args=(db_gallery_id, galleryinfo_params.gid),
-            )
-            threads.append(
-                target=self._insert_gallery_title,
-                args=(db_gallery_id, galleryinfo_params.title),
-            )
-            threads.append(
-                target=self._insert_upload_time,
-                args=(db_gallery_id, galleryinfo_params.upload_time),
-            )
-            threads.append(
-                target=self._insert_gallery_comment,
-                args=(db_gallery_id, galleryinfo_params.galleries_comments),
-            )
-            threads.append(
-                target=self._insert_gallery_upload_account,
-                args=(db_gallery_id, galleryinfo_params.upload_account),
-            )
-            threads.append(
-                target=self._insert_download_time,
-                args=(db_gallery_id, galleryinfo_params.download_time),
-            )
-            threads.append(
-                target=self._insert_access_time,
-                args=(db_gallery_id, galleryinfo_params.download_time),
-            )
-            threads.append(
-                target=self._insert_modified_time,
-                args=(db_gallery_id, galleryinfo_params.modified_time),
-            )
-            threads.append(
-                target=self._insert_gallery_files,
-                args=(db_gallery_id, galleryinfo_params.files_path),
-            )
+        db_gallery_id = self._insert_gallery_name(galleryinfo_params.gallery_name)
 
-        file_pairs = list[FileInformation]()
-        for file_path in galleryinfo_params.files_path:
-            db_file_id = self._get_db_file_id(db_gallery_id, file_path)
-            absolute_file_path = os.path.join(
-                galleryinfo_params.gallery_folder, file_path
-            )
-            file_pairs.append(FileInformation(absolute_file_path, db_file_id))
-        self._insert_gallery_file_hash_for_db_gallery_id(file_pairs)
+        # Runs inside the caller's transaction, so the inserts share one
+        # connection instead of fanning out to threads with their own.
+        self._insert_gallery_infos(db_gallery_id, galleryinfo_params)
+        db_file_ids = self._insert_gallery_files(
+            db_gallery_id, galleryinfo_params.files_path
+        )
+        self._insert_gallery_file_stats(db_file_ids, file_stats)
 
         taglist = list[TagInformation]()
         for tag in galleryinfo_params.tags:
             taglist.append(TagInformation(tag[0], tag[1]))
         self._insert_gallery_tags(db_gallery_id, taglist)
 
+        self._insert_gallery_file_hash_for_db_gallery_id(
+            db_file_ids, absolute_file_paths, known_digests
+        )
+
         self.delete_pending_gallery_removal(galleryinfo_params.gallery_name)
 
     def _check_gallery_info_file_hash(
-        self, galleryinfo_params: GalleryInfoParser
+        self,
+        galleryinfo_params: GalleryInfoParser,
+        known_digests: dict[str, dict[str, bytes]],
     ) -> bool:
-        if not self._check_galleries_dbids_by_gallery_name(
-            galleryinfo_params.gallery_name
-        ):
-            return False
-        db_gallery_id = self._get_db_gallery_id_by_gallery_name(
-            galleryinfo_params.gallery_name
+        algorithmlist = self.config.h2h.hash_algorithms
+        query_result = self._get_file_hashs_and_stat_by_gallery_name_and_file_name(
+            galleryinfo_params.gallery_name, GALLERY_INFO_FILE_NAME, algorithmlist
         )
-
-        if not self._check_db_file_id(db_gallery_id, GALLERY_INFO_FILE_NAME):
+        if query_result is None:
+            return False
+        db_file_id, size, mtime_ns, *original_hash_values = query_result
+        # A digest missing for a newly configured algorithm forces the gallery
+        # to be reinserted, even when the stat of the info file is unchanged.
+        if None in original_hash_values:
             return False
-        gallery_info_file_id = self._get_db_file_id(
-            db_gallery_id, GALLERY_INFO_FILE_NAME
-        )
         absolute_file_path = os.path.join(
             galleryinfo_params.gallery_folder, GALLERY_INFO_FILE_NAME
         )
 
-        if not self._check_hash_value_by_file_id(
-            gallery_info_file_id, COMPARISON_HASH_ALGORITHM
-        ):
-            return False
-        original_hash_value = self.get_hash_value_by_file_id(
-            gallery_info_file_id, COMPARISON_HASH_ALGORITHM
+        file_stat = os.stat(absolute_file_path)
+        if (size, mtime_ns) == (file_stat.st_size, file_stat.st_mtime_ns):
+            return True
+
+        # Every configured digest is taken in the same pass, so that a changed
+        # info file is not read and hashed again when the gallery is reinserted.
+        known_digests[absolute_file_path] = hash_functions_by_file(
+            absolute_file_path, algorithmlist
         )
-        current_hash_value = hash_function_by_file(
-            absolute_file_path, COMPARISON_HASH_ALGORITHM
+        current_hash_values = [
+            known_digests[absolute_file_path][algorithm] for algorithm in algorithmlist
+        ]
+        issame = b"".join(map(bytes, original_hash_values)) == b"".join(
+            current_hash_values
         )
-        issame = original_hash_value == current_hash_value
+        if issame:
+            self._insert_gallery_file_stats([db_file_id], [file_stat])
         return issame
 
     def _get_duplicated_hash_values_by_count_artist_ratio(self) -> list[bytes]:
         with self.SQLConnector() as connector:
             table_name = "duplicated_hash_values_by_count_artist_ratio"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
                     select_query = f"""
                         SELECT hash_value
                         FROM {table_name}
                     """
 
-            query_result = connector.fetch_all(select_query)
-        return [query[0] for query in query_result]
+            duplicated_hash_values = [
+                query[0] for query in connector.fetch_iter(select_query)
+            ]
+        return duplicated_hash_values
 
     def insert_gallery_info(self, gallery_folder: str) -> bool:
         galleryinfo_params = parse_galleryinfo(gallery_folder)
-        is_thesame = self._check_gallery_info_file_hash(galleryinfo_params)
+        known_digests = dict[str, dict[str, bytes]]()
+        is_thesame = self._check_gallery_info_file_hash(
+            galleryinfo_params, known_digests
+        )
         is_insert = is_thesame is False
         if is_insert:
             self.logger.debug(
-                f"Inserting gallery '{galleryinfo_params.gallery_name}'..."
+                "Inserting gallery '%s'...", galleryinfo_params.gallery_name
             )
             self.delete_gallery_file(galleryinfo_params.gallery_name)
-            self.delete_gallery(galleryinfo_params.gallery_name)
-            self._insert_gallery_info(galleryinfo_params)
-            self.logger.debug(f"Gallery '{galleryinfo_params.gallery_name}' inserted.")
+            self._get_unchanged_files_digests(galleryinfo_params, known_digests)
+
+            # Paths and stats are taken once per file and shared by the stat and
+            # hash inserts. Every file is hashed before the transaction opens,
+            # so that its row locks are not held while the files are read.
+            folder_prefix = os.path.join(galleryinfo_params.gallery_folder, "")
+            absolute_file_paths = [
+                folder_prefix + file_path
+                for file_path in galleryinfo_params.files_path
+            ]
+            file_stats = [
+                os.stat(absolute_file_path)
+                for absolute_file_path in absolute_file_paths
+            ]
+            self._hash_gallery_files(
+                absolute_file_paths,
+                [file_stat.st_size for file_stat in file_stats],
+                known_digests,
+            )
+
+            # Galleries sharing tags or files may deadlock one another; the
+            # aborted transaction has been rolled back and is run again.
+            for attempt in range(1, TRANSACTION_RETRY_LIMIT + 1):
+                try:
+                    with self.SQLConnector() as connector, connector.transaction():
+                        self.delete_gallery(galleryinfo_params.gallery_name)
+                        self._insert_gallery_info(
+                            galleryinfo_params,
+                            absolute_file_paths,
+                            file_stats,
+                            known_digests,
+                        )
+                except DatabaseTransactionError as e:
+                    if attempt == TRANSACTION_RETRY_LIMIT:
+                        raise
+                    self.logger.warning(
+                        "Retrying gallery '%s' (%s).",
+                        galleryinfo_params.gallery_name,
+                        e.message,
+                    )
+                else:
+                    break
+            self.logger.debug(
+                "Gallery '%s' inserted.", galleryinfo_params.gallery_name
+            )
         return is_insert
 
     def compress_gallery_to_cbz(
@@ -2632,15 +2939,18 @@ class H2HDB(
             cbz_directory, gallery_name2cbz_file_name(galleryinfo_params.gallery_name)
         )
         if os.path.exists(cbz_path):
-            db_gallery_id = self._get_db_gallery_id_by_gallery_name(
-                galleryinfo_params.gallery_name
-            )
-            gallery_info_file_id = self._get_db_file_id(
-                db_gallery_id, GALLERY_INFO_FILE_NAME
-            )
-            original_hash_value = self.get_hash_value_by_file_id(
-                gallery_info_file_id, COMPARISON_HASH_ALGORITHM
+            # The gallery, its info file and the stored hash are resolved in one
+            # query rather than one lookup each.
+            query_result = self._get_file_hashs_and_stat_by_gallery_name_and_file_name(
+                galleryinfo_params.gallery_name,
+                GALLERY_INFO_FILE_NAME,
+                [COMPARISON_HASH_ALGORITHM],
             )
+            if query_result is None or query_result[-1] is None:
+                msg = f"Image hash for gallery '{galleryinfo_params.gallery_name}' and file '{GALLERY_INFO_FILE_NAME}' does not exist."
+                self.logger.error(msg)
+                raise DatabaseKeyError(msg)
+            original_hash_value = query_result[-1]
             cbz_hash_value = calculate_hash_of_file_in_cbz(
                 cbz_path, GALLERY_INFO_FILE_NAME, COMPARISON_HASH_ALGORITHM
             )
@@ -2671,12 +2981,10 @@ class H2HDB(
 
         with self.SQLConnector() as connector:
             tmp_table_name = "tmp_current_galleries"
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
-                    column_name = "name"
-                    column_name_parts, create_gallery_name_parts_sql = (
-                        self.mysql_split_gallery_name_based_on_limit(column_name)
-                    )
+                    column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                    create_gallery_name_parts_sql = MYSQL_GALLERY_NAME_PARTS_DDL
                     query = f"""
                         CREATE TEMPORARY TABLE IF NOT EXISTS {tmp_table_name} (
                             PRIMARY KEY ({", ".join(column_name_parts)}),
@@ -2686,47 +2994,51 @@ class H2HDB(
 
             connector.execute(query)
             self.logger.info(f"{tmp_table_name} table created.")
+            # Pooled connections keep their session, so the table is dropped
+            # here; a later scan on the same connection must start empty.
+            try:
+                match self.sql_type:
+                    case "mysql":
+                        column_name_parts = MYSQL_GALLERY_NAME_PARTS
+                        insert_query = f"""
+                            INSERT INTO {tmp_table_name}
+                                ({", ".join(column_name_parts)})
+                            VALUES ({", ".join(["%s" for _ in column_name_parts])})
+                        """
 
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    column_name_parts, _ = self.mysql_split_gallery_name_based_on_limit(
-                        "name"
-                    )
-                    insert_query = f"""
-                        INSERT INTO {tmp_table_name}
-                            ({", ".join(column_name_parts)})
-                        VALUES ({", ".join(["%s" for _ in column_name_parts])})
-                    """
-
-            data = list[tuple]()
-            current_galleries_folders = list[str]()
-            current_galleries_names = list[str]()
-            for root, _, files in os.walk(self.config.h2h.download_path):
-                if GALLERY_INFO_FILE_NAME in files:
+                data = list[tuple]()
+                current_galleries_folders = list[str]()
+                current_galleries_names = list[str]()
+                for root in walk_gallery_folders(self.config.h2h.download_path):
                     current_galleries_folders.append(root)
-                    gallery_name = os.path.basename(current_galleries_folders[-1])
+                    gallery_name = os.path.basename(root)
                     current_galleries_names.append(gallery_name)
                     gallery_name_parts = self._split_gallery_name(gallery_name)
                     data.append(tuple(gallery_name_parts))
-            group_size = 5000
-            it = iter(data)
-            for _ in range(0, len(data), group_size):
-                connector.execute_many(insert_query, list(islice(it, group_size)))
+                group_size = 5000
+                it = iter(data)
+                for _ in range(0, len(data), group_size):
+                    connector.execute_many(insert_query, list(islice(it, group_size)))
 
-            match self.config.database.sql_type.lower():
-                case "mysql":
-                    fetch_query = f"""
-                        SELECT CONCAT({",".join(["galleries_dbids."+column_name for column_name in column_name_parts])})
-                        FROM galleries_dbids
-                        LEFT JOIN {tmp_table_name} USING ({",".join(column_name_parts)})
-                        WHERE {tmp_table_name}.{column_name_parts[0]} IS NULL
-                    """
-            removed_galleries = connector.fetch_all(fetch_query)
-            if len(removed_galleries) > 0:
-                removed_galleries = [gallery[0] for gallery in removed_galleries]
+                match self.sql_type:
+                    case "mysql":
+                        fetch_query = f"""
+                            SELECT CONCAT({",".join(["galleries_dbids."+column_name for column_name in column_name_parts])})
+                            FROM galleries_dbids
+                            LEFT JOIN {tmp_table_name} USING ({",".join(column_name_parts)})
+                            WHERE {tmp_table_name}.{column_name_parts[0]} IS NULL
+                        """
+                removed_galleries = [
+                    gallery[0] for gallery in connector.fetch_iter(fetch_query)
+                ]
+            finally:
+                match self.sql_type:
+                    case "mysql":
+                        drop_query = f"DROP TEMPORARY TABLE IF EXISTS {tmp_table_name}"
+                connector.execute(drop_query)
 
-        for removed_gallery in removed_galleries:
-            self.insert_pending_gallery_removal(removed_gallery)
+        with self.SQLConnector() as connector, connector.transaction():
+            self.insert_pending_gallery_removals(removed_galleries)
 
         self.delete_pending_gallery_removals()
 
@@ -2762,20 +3074,22 @@ class H2HDB(
     def _refresh_current_files_hashs(self, algorithm: str) -> None:
         if algorithm not in HASH_ALGORITHMS:
             raise ValueError(
-                f"Invalid hash algorithm: {algorithm} not in {HASH_ALGORITHMS}"
+                f"Invalid hash algorithm: {algorithm} not in {list(HASH_ALGORITHMS)}"
             )
 
         with self.SQLConnector() as connector:
-            match self.config.database.sql_type.lower():
+            match self.sql_type:
                 case "mysql":
+                    # Each hash is probed once on the (db_hash_id, db_file_id)
+                    # index of the file table, which covers the lookup; the
+                    # outer join it replaces fanned out to one row per file.
                     get_delete_db_hash_id_query = (
                         lambda x, y: f"""
                         DELETE FROM {y}
-                        WHERE db_hash_id IN (
-                                SELECT db_hash_id
+                        WHERE NOT EXISTS (
+                                SELECT 1
                                 FROM {x}
-                                RIGHT JOIN {y} USING (db_hash_id)
-                                WHERE {x}.db_hash_id IS NULL
+                                WHERE {x}.db_hash_id = {y}.db_hash_id
                             )
                         """
                     )
@@ -2786,7 +3100,16 @@ class H2HDB(
             )
 
     def refresh_current_files_hashs(self):
-        algorithmlist = list(HASH_ALGORITHMS.keys())
+        algorithmlist = list(self.config.h2h.hash_algorithms)
+        # Tables of algorithms that are no longer configured are still cleaned:
+        # their file rows go with deleted galleries, and the hash values left
+        # behind are removed here.
+        with self.SQLConnector() as connector:
+            for algorithm in HASH_ALGORITHMS:
+                if algorithm not in algorithmlist and connector.check_table_exists(
+                    f"files_hashs_{algorithm.lower()}_dbids"
+                ):
+                    algorithmlist.append(algorithm)
         with SQLThreadsList() as threads:
             for algorithm in algorithmlist:
                 threads.append(
@@ -2864,32 +3187,49 @@ class H2HDB(
             current_galleries_folders, 100 * POOL_CPU_LIMIT
         )
         self.logger.info("Inserting galleries in parallel...")
-        for gallery_chunk in chunked_galleries_folders:
-            # Insert gallery info to database
-            is_insert_list = run_in_parallel(
-                self.insert_gallery_info,
-                [(x,) for x in gallery_chunk],
-            )
-            if any(is_insert_list):
-                self.logger.info("There are new galleries inserted in database.")
-                is_insert_limit_reached |= True
-                total_inserted_in_database += sum(is_insert_list)
+        # One pool serves every chunk. The next chunk is queued for insertion
+        # before the current one is compressed, so the workers stay busy while
+        # the last galleries of a chunk finish instead of idling at each step.
+        with create_process_pool() as pool:
+            def submit_insert(gallery_chunk: list[str]) -> AsyncResult:
+                return submit_in_parallel(
+                    pool, self.insert_gallery_info, [(x,) for x in gallery_chunk]
+                )
 
-            # Compress gallery to CBZ file
-            if self.config.h2h.cbz_path != "":
+            pending_insert_list = None
+            for n, gallery_chunk in enumerate(chunked_galleries_folders):
+                # Insert gallery info to database
+                if pending_insert_list is None:
+                    pending_insert_list = submit_insert(gallery_chunk)
+                is_insert_list = pending_insert_list.get()
+                pending_insert_list = None
+                if n + 1 < len(chunked_galleries_folders):
+                    pending_insert_list = submit_insert(
+                        chunked_galleries_folders[n + 1]
+                    )
+                # The workers may have reinserted galleries under new IDs.
+                self._db_gallery_id_cache.clear()
                 if any(is_insert_list):
-                    previously_count_duplicated_files, exclude_hashs = (
-                        calculate_exclude_hashs(
-                            previously_count_duplicated_files, exclude_hashs
+                    self.logger.info("There are new galleries inserted in database.")
+                    is_insert_limit_reached |= True
+                    total_inserted_in_database += sum(is_insert_list)
+
+                # Compress gallery to CBZ file
+                if self.config.h2h.cbz_path != "":
+                    if any(is_insert_list):
+                        previously_count_duplicated_files, exclude_hashs = (
+                            calculate_exclude_hashs(
+                                previously_count_duplicated_files, exclude_hashs
+                            )
                         )
+                    is_new_list = run_in_parallel(
+                        self.compress_gallery_to_cbz,
+                        [(x, exclude_hashs) for x in gallery_chunk],
+                        pool,
                     )
-                is_new_list = run_in_parallel(
-                    self.compress_gallery_to_cbz,
-                    [(x, exclude_hashs) for x in gallery_chunk],
-                )
-                if any(is_new_list):
-                    self.logger.info("There are new CBZ files created.")
-                    total_created_cbz += sum(is_new_list)
+                    if any(is_new_list):
+                        self.logger.info("There are new CBZ files created.")
+                        total_created_cbz += sum(is_new_list)
         self.logger.info(
             f"Total galleries inserted in database: {total_inserted_in_database}"
         )
@@ -54,19 +54,19 @@ def setup_file_logger(level: int) -> logging.Logger:
 
 class AbstractLogger(metaclass=ABCMeta):
     @abstractmethod
-    def debug(self, message: str) -> None: ...
+    def debug(self, message: str, *args: object) -> None: ...
 
     @abstractmethod
-    def info(self, message: str) -> None: ...
+    def info(self, message: str, *args: object) -> None: ...
 
     @abstractmethod
-    def warning(self, message: str) -> None: ...
+    def warning(self, message: str, *args: object) -> None: ...
 
     @abstractmethod
-    def error(self, message: str) -> None: ...
+    def error(self, message: str, *args: object) -> None: ...
 
     @abstractmethod
-    def critical(self, message: str) -> None: ...
+    def critical(self, message: str, *args: object) -> None: ...
 
 
 class HentaiDBLogger(AbstractLogger):
@@ -75,26 +75,30 @@ class HentaiDBLogger(AbstractLogger):
         self.screen_logger = setup_screen_logger(logging_level)
         self.file_logger = setup_file_logger(logging_level)
 
-    def debug(self, message: str) -> None:
-        self._log_method("debug", message)
+    def debug(self, message: str, *args: object) -> None:
+        # Debug messages are dropped before any formatting at the usual levels.
+        if self.screen_logger.isEnabledFor(
+            logging.DEBUG
+        ) or self.file_logger.isEnabledFor(logging.DEBUG):
+            self._log_method("debug", message, *args)
 
-    def info(self, message: str) -> None:
-        self._log_method("info", message)
+    def info(self, message: str, *args: object) -> None:
+        self._log_method("info", message, *args)
 
-    def warning(self, message: str) -> None:
-        self._log_method("warning", message)
+    def warning(self, message: str, *args: object) -> None:
+        self._log_method("warning", message, *args)
 
-    def error(self, message: str) -> None:
-        self._log_method("error", message)
+    def error(self, message: str, *args: object) -> None:
+        self._log_method("error", message, *args)
 
-    def critical(self, message: str) -> None:
-        self._log_method("critical", message)
+    def critical(self, message: str, *args: object) -> None:
+        self._log_method("critical", message, *args)
 
-    def _log_method(self, level: str, message: str) -> None:
+    def _log_method(self, level: str, message: str, *args: object) -> None:
         log_method_screen = getattr(self.screen_logger, level)
         log_method_file = getattr(self.file_logger, level)
-        log_method_screen(message)
-        log_method_file(message)
+        log_method_screen(message, *args)
+        log_method_file(message, *args)
 
     def hasHandlers(self) -> bool:
         return self.screen_logger.hasHandlers() or self.file_logger.hasHandlers()
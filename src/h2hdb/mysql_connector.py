@@ -1,11 +1,28 @@
+import os
+from time import monotonic
+from typing import Iterator
+
 from mysql.connector.pooling import PooledMySQLConnection
 from mysql.connector.abstracts import MySQLConnectionAbstract
 from mysql.connector import connect as SQLConnect
-from mysql.connector.errors import IntegrityError
-
-from .sql_connector import SQLConnectorParams, SQLConnector, DatabaseDuplicateKeyError
-
-AUTO_COMMIT_KEYS = ["INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER"]
+from mysql.connector.errors import Error, IntegrityError
+
+from .sql_connector import (
+    SQLConnectorParams,
+    SQLConnector,
+    DatabaseDuplicateKeyError,
+    DatabaseTransactionError,
+)
+
+# Closed connectors hand their connection back here, so the next connector of
+# the same process reuses it instead of opening a new one. Connections left
+# idle longer than MAX_IDLE_SECONDS are closed rather than reused, to stay well
+# within the server's wait_timeout.
+MAX_IDLE_CONNECTIONS = 8
+MAX_IDLE_SECONDS = 60.0
+_idle_cursors = dict[tuple, list[tuple[float, "MySQLCursor"]]]()
+# ER_LOCK_WAIT_TIMEOUT and ER_LOCK_DEADLOCK; the transaction can be run again.
+MYSQL_RETRYABLE_ERRNOS = (1205, 1213)
 
 
 class MySQLDuplicateKeyError(DatabaseDuplicateKeyError):
@@ -20,6 +37,18 @@ class MySQLDuplicateKeyError(DatabaseDuplicateKeyError):
         super().__init__(self.message)
 
 
+class MySQLTransactionError(DatabaseTransactionError):
+    """
+    Custom exception class for MySQL lock wait timeouts and deadlocks.
+
+    This class inherits from the DatabaseTransactionError class.
+    """
+
+    def __init__(self, message) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
 class MySQLConnectorParams(SQLConnectorParams):
     """
     MySQLConnectorParams is a data class that holds the connection parameters required to connect to a MySQL database.
@@ -50,13 +79,71 @@ class MySQLCursor:
         self, connection: PooledMySQLConnection | MySQLConnectionAbstract
     ) -> None:
         self.connection = connection
+        self.cursor = None
 
     def __enter__(self):
-        self.cursor = self.connection.cursor(buffered=True)
+        # The buffered cursor holds no server-side state once a statement has
+        # been read, so one cursor is kept for the lifetime of the connection.
+        # Prepared cursors are not used: they cannot be buffered, only reuse a
+        # statement while the identical query object is passed again, and send
+        # COM_STMT_RESET before every execution, which costs more round trips
+        # than the server-side parse they save on these short statements.
+        if self.cursor is None:
+            self.cursor = self.connection.cursor(buffered=True)
         return self.cursor
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.cursor.close()
+        pass
+
+    def close(self) -> None:
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+
+
+def _idle_cursors_key(params: MySQLConnectorParams) -> tuple:
+    # Keyed on the process ID as well, so that a forked worker never reuses a
+    # socket inherited from its parent.
+    return (os.getpid(), *sorted(params.items()))
+
+
+def _acquire_cursor(params: MySQLConnectorParams) -> "MySQLCursor":
+    idle_cursors = _idle_cursors.get(_idle_cursors_key(params), [])
+    while len(idle_cursors) > 0:
+        try:
+            released_at, cursor = idle_cursors.pop()
+        except IndexError:
+            break
+        if monotonic() - released_at < MAX_IDLE_SECONDS:
+            return cursor
+        _close_cursor(cursor)
+    # Statements outside 'transaction' are committed by the server as they run,
+    # so reads hold no snapshot between statements and writes need no COMMIT.
+    return MySQLCursor(SQLConnect(**params, autocommit=True))
+
+
+def _release_cursor(params: MySQLConnectorParams, cursor: "MySQLCursor") -> None:
+    try:
+        # Only a transaction left open by an error can remain here; it must not
+        # leak into the next user of the connection.
+        if cursor.connection.in_transaction:
+            cursor.connection.rollback()
+    except Error:
+        _close_cursor(cursor)
+        return
+    idle_cursors = _idle_cursors.setdefault(_idle_cursors_key(params), [])
+    if len(idle_cursors) < MAX_IDLE_CONNECTIONS:
+        idle_cursors.append((monotonic(), cursor))
+    else:
+        _close_cursor(cursor)
+
+
+def _close_cursor(cursor: "MySQLCursor") -> None:
+    try:
+        cursor.close()
+        cursor.connection.close()
+    except Error:
+        pass
 
 
 class MySQLConnector(SQLConnector):
@@ -67,19 +154,29 @@ class MySQLConnector(SQLConnector):
 
     The 'connect' method establishes a connection to the MySQL database using the provided connection parameters.
 
-    The 'close' method closes the connection to the MySQL database.
+    The 'close' method releases the connection to the MySQL database. Connections are kept open per process and reused by later connectors with the same parameters.
 
     The 'execute' method executes a single SQL command on the MySQL database.
 
+    The 'execute_returning_id' method executes a single INSERT command on the MySQL database and returns the generated ID.
+
+    The 'execute_returning_rowcount' method executes a single SQL command on the MySQL database and returns the number of affected rows.
+
     The 'execute_many' method executes multiple SQL commands on the MySQL database.
 
     The 'fetch_one' method fetches a single result from the MySQL database.
 
     The 'fetch_all' method fetches all results from the MySQL database.
 
+    The 'fetch_iter' method streams results from the MySQL database with an unbuffered cursor, so large result sets are never held in memory as a whole.
+
+    The 'begin' method starts a READ COMMITTED transaction on the MySQL database.
+
     The 'commit' method commits the current transaction to the MySQL database.
 
     The 'rollback' method rolls back the current transaction in the MySQL database.
+
+    The connection runs in autocommit mode: data-modifying commands are committed as soon as they are executed and reads see the latest committed data, unless they run inside 'transaction', which is READ COMMITTED and committed together when it ends.
     """
 
     def __init__(
@@ -88,16 +185,26 @@ class MySQLConnector(SQLConnector):
         self.params = MySQLConnectorParams(host, port, user, password, database)
 
     def connect(self) -> None:
-        self.connection = SQLConnect(**self.params)
+        self.cursor = _acquire_cursor(self.params)
+        self.connection = self.cursor.connection
 
     def close(self) -> None:
-        self.connection.close()
+        _release_cursor(self.params, self.cursor)
 
     def check_table_exists(self, table_name: str) -> bool:
-        query = f"SHOW TABLES LIKE '{table_name}'"
-        result = self.fetch_one(query)
+        # The name is passed as a parameter rather than spliced into a LIKE
+        # pattern, where it was unescaped and '_' matched any character.
+        query = """
+            SELECT 1
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """
+        result = self.fetch_one(query, (table_name,))
         return result is not None
 
+    def begin(self) -> None:
+        self.connection.start_transaction(isolation_level="READ COMMITTED")
+
     def commit(self) -> None:
         self.connection.commit()
 
@@ -105,31 +212,72 @@ class MySQLConnector(SQLConnector):
         self.connection.rollback()
 
     def execute(self, query: str, data: tuple = ()) -> None:
-        with MySQLCursor(self.connection) as cursor:
+        with self.cursor as cursor:
             try:
                 cursor.execute(query, data)
             except IntegrityError as e:
                 raise MySQLDuplicateKeyError(str(e))
-        if any(key in query.upper() for key in AUTO_COMMIT_KEYS):
-            self.commit()
+            except Error as e:
+                if e.errno in MYSQL_RETRYABLE_ERRNOS:
+                    raise MySQLTransactionError(str(e))
+                raise
+
+    def execute_returning_id(self, query: str, data: tuple = ()) -> int:
+        with self.cursor as cursor:
+            try:
+                cursor.execute(query, data)
+            except IntegrityError as e:
+                raise MySQLDuplicateKeyError(str(e))
+            except Error as e:
+                if e.errno in MYSQL_RETRYABLE_ERRNOS:
+                    raise MySQLTransactionError(str(e))
+                raise
+            lastrowid = cursor.lastrowid
+        return lastrowid  # type: ignore
+
+    def execute_returning_rowcount(self, query: str, data: tuple = ()) -> int:
+        with self.cursor as cursor:
+            try:
+                cursor.execute(query, data)
+            except IntegrityError as e:
+                raise MySQLDuplicateKeyError(str(e))
+            except Error as e:
+                if e.errno in MYSQL_RETRYABLE_ERRNOS:
+                    raise MySQLTransactionError(str(e))
+                raise
+            rowcount = cursor.rowcount
+        return rowcount
 
     def execute_many(self, query: str, data: list[tuple]) -> None:
-        with MySQLCursor(self.connection) as cursor:
+        with self.cursor as cursor:
             try:
                 cursor.executemany(query, data)
             except IntegrityError as e:
                 raise MySQLDuplicateKeyError(str(e))
-        if any(key in query.upper() for key in AUTO_COMMIT_KEYS):
-            self.commit()
+            except Error as e:
+                if e.errno in MYSQL_RETRYABLE_ERRNOS:
+                    raise MySQLTransactionError(str(e))
+                raise
 
     def fetch_one(self, query: str, data: tuple = ()) -> tuple:
-        with MySQLCursor(self.connection) as cursor:
+        with self.cursor as cursor:
             cursor.execute(query, data)
             vlist = cursor.fetchone()
         return vlist  # type: ignore
 
     def fetch_all(self, query: str, data: tuple = ()) -> list:
-        with MySQLCursor(self.connection) as cursor:
+        with self.cursor as cursor:
             cursor.execute(query, data)
             vlist = cursor.fetchall()
         return vlist
+
+    def fetch_iter(self, query: str, data: tuple = ()) -> Iterator[tuple]:
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            cursor.execute(query, data)
+            yield from cursor  # type: ignore
+        finally:
+            # Rows left unread would block the next query on this connection.
+            if cursor.with_rows:
+                cursor.fetchall()
+            cursor.close()
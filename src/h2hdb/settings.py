@@ -2,27 +2,106 @@ __all__ = [
     "FOLDER_NAME_LENGTH_LIMIT",
     "FILE_NAME_LENGTH_LIMIT",
     "COMPARISON_HASH_ALGORITHM",
+    "HASH_ALGORITHMS",
+    "DEFAULT_HASH_ALGORITHMS",
     "GALLERY_INFO_FILE_NAME",
     "hash_function",
     "hash_function_by_file",
+    "hash_functions_by_file",
+    "get_hash_constructor",
 ]
 
 import hashlib
+import mmap
+import os
+from functools import cache, partial
+from typing import Callable
 
 FOLDER_NAME_LENGTH_LIMIT = 255
 FILE_NAME_LENGTH_LIMIT = 255
 COMPARISON_HASH_ALGORITHM = "sha512"
+HASH_ALGORITHMS = dict[str, int](sha512=512, sha3_512=512, blake2b=512)
+# sha3_512 takes about as long as the other two together, so it is opt-in.
+DEFAULT_HASH_ALGORITHMS = ["sha512", "blake2b"]
 GALLERY_INFO_FILE_NAME = "galleryinfo.txt"
+HASH_CHUNK_SIZE = 1 << 20
+HASH_MMAP_THRESHOLD = 1 << 20
+DB_GALLERY_ID_CACHE_SIZE = 4096
+SPLIT_NAME_CACHE_SIZE = 4096
+ACCESS_TIME_FLUSH_SIZE = 256
+ACCESS_TIME_FLUSH_SECONDS = 60.0
+MULTI_ROW_INSERT_SIZE = 1000
+TRANSACTION_RETRY_LIMIT = 3
+
+
+@cache
+def get_hash_constructor(algorithm: str) -> Callable:
+    """
+    Returns the fastest available hash constructor for the algorithm.
+
+    The named hashlib constructors are bound to OpenSSL's EVP implementations
+    (SHA-NI/AVX2 where the CPU supports them) or to the vectorised builtin BLAKE2,
+    so they are preferred; `hashlib.new` covers any other algorithm OpenSSL offers.
+    """
+    algorithm = algorithm.lower()
+    if algorithm in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, algorithm)
+    return partial(hashlib.new, algorithm)
 
 
 def hash_function(x: bytes, algorithm: str) -> bytes:
-    return getattr(hashlib, algorithm.lower())(x).digest()
+    return get_hash_constructor(algorithm)(x).digest()
 
 
 def hash_function_by_file(file_path: str, algorithm: str) -> bytes:
-    with open(file_path, "rb") as f:
-        file_content = f.read()
-    return hash_function(file_content, algorithm)
+    return hash_functions_by_file(file_path, [algorithm])[algorithm]
+
+
+def hash_functions_by_file(file_path: str, algorithms: list[str]) -> dict[str, bytes]:
+    """
+    Hashes a file with several algorithms in a single pass.
+
+    The file is streamed through a reusable buffer and every chunk is fed to all
+    hashers, so the file is read once and never held in memory as a whole. Large
+    files are memory-mapped instead, which lets the hashers read the page cache
+    directly without copying into a userspace buffer; the window after the one
+    being hashed is prefetched so that disk reads overlap with hashing. Where
+    available, the kernel is told up front that the whole file will be read
+    sequentially.
+    """
+    hashers = [get_hash_constructor(algorithm)() for algorithm in algorithms]
+    updates = [hasher.update for hasher in hashers]
+    with open(file_path, "rb", buffering=0) as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        if file_size >= HASH_MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    for offset in range(0, file_size, HASH_CHUNK_SIZE):
+                        next_offset = offset + HASH_CHUNK_SIZE
+                        if hasattr(mmap, "MADV_WILLNEED") and next_offset < file_size:
+                            mm.madvise(
+                                mmap.MADV_WILLNEED,
+                                next_offset,
+                                min(HASH_CHUNK_SIZE, file_size - next_offset),
+                            )
+                        with view[offset:next_offset] as chunk:
+                            for update in updates:
+                                update(chunk)
+        else:
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while size := f.readinto(buffer):
+                chunk = view[:size]
+                for update in updates:
+                    update(chunk)
+    return {
+        algorithm: hasher.digest() for algorithm, hasher in zip(algorithms, hashers)
+    }
 
 
 def chunk_list(input_list: list, chunk_size: int) -> list:
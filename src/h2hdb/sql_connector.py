@@ -7,7 +7,12 @@ __all__ = [
 ]
 
 
+import threading
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+_transaction = threading.local()
 
 
 class DatabaseConfigurationError(Exception):
@@ -46,6 +51,18 @@ class DatabaseDuplicateKeyError(Exception):
         super().__init__(self.message)
 
 
+class DatabaseTransactionError(Exception):
+    """
+    Custom exception class for transactions aborted by the database, such as on a lock wait timeout or a deadlock.
+
+    The transaction has been rolled back and can be run again. This class inherits from the built-in Python Exception class.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
 class DatabaseTableError(Exception):
     """
     Custom exception class for database table errors.
@@ -71,7 +88,7 @@ class SQLConnector(metaclass=ABCMeta):
 
     The constructor takes in the necessary parameters to establish a database connection, such as host, port, user, password, and database.
 
-    The 'connect', 'close', 'check_table_exists', 'execute', 'execute_many', 'fetch_one', 'fetch_all', 'commit', and 'rollback' methods are abstract and must be implemented by concrete subclasses.
+    The 'connect', 'close', 'check_table_exists', 'execute', 'execute_returning_id', 'execute_returning_rowcount', 'execute_many', 'fetch_one', 'fetch_all', 'fetch_iter', 'begin', 'commit', and 'rollback' methods are abstract and must be implemented by concrete subclasses.
 
     The 'connect' method is designed to establish a connection to the database. It doesn't take any parameters.
 
@@ -81,15 +98,25 @@ class SQLConnector(metaclass=ABCMeta):
 
     The 'execute' method is designed to execute a single SQL command. It takes a SQL query string and a tuple of data as parameters.
 
+    The 'execute_returning_id' method is designed to execute a single INSERT command and return the auto-increment ID it generated. It takes a SQL query string and a tuple of data as parameters.
+
+    The 'execute_returning_rowcount' method is designed to execute a single SQL command and return the number of rows it affected. It takes a SQL query string and a tuple of data as parameters.
+
     The 'execute_many' method is designed to execute multiple SQL commands. It takes a SQL query string and a list of tuples as parameters, where each tuple contains the data for one command.
 
     The 'fetch_one' method is designed to fetch a single result from the database. It takes a SQL query string and a tuple of data as parameters.
 
     The 'fetch_all' method is designed to fetch all results from the database. It takes a SQL query string and a tuple of data as parameters.
 
+    The 'fetch_iter' method is designed to stream results from the database row by row. It takes a SQL query string and a tuple of data as parameters.
+
+    The 'begin' method is designed to start a transaction explicitly. It doesn't take any parameters.
+
     The 'commit' method is designed to commit the current transaction to the database. It doesn't take any parameters.
 
     The 'rollback' method is designed to roll back the current transaction in the database. It doesn't take any parameters.
+
+    The 'transaction' method is a context manager that runs everything inside it as one transaction. While it is active, entering any other connector in the same thread yields this connector instead of opening a new connection, and changes are committed once on exit.
     """
 
     @abstractmethod
@@ -124,12 +151,47 @@ class SQLConnector(metaclass=ABCMeta):
         """
         Establishes a connection to the SQL database.
 
+        If a transaction is active in the current thread, its connector is returned
+        instead and no new connection is made.
+
         Returns:
-            SQLConnector: The SQLConnector object itself.
+            SQLConnector: The SQLConnector object itself, or the connector of the active transaction.
         """
+        connector = getattr(_transaction, "connector", None)
+        self.is_borrowed = connector is not None
+        if self.is_borrowed:
+            return connector
         self.connect()
         return self
 
+    @contextmanager
+    def transaction(self) -> Iterator["SQLConnector"]:
+        """
+        Runs the enclosed statements in a single transaction on this connection.
+
+        Commits once on success and rolls back if an exception is raised. Nested
+        calls join the outer transaction.
+
+        Yields:
+            SQLConnector: The connector that owns the transaction.
+        """
+        connector = getattr(_transaction, "connector", None)
+        if connector is not None:
+            yield connector
+            return
+
+        self.begin()
+        _transaction.connector = self
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        else:
+            self.commit()
+        finally:
+            _transaction.connector = None
+
     @abstractmethod
     def check_table_exists(self, table_name: str) -> bool:
         """
@@ -143,6 +205,19 @@ class SQLConnector(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def begin(self) -> None:
+        """
+        Starts a transaction explicitly.
+
+        The transaction reads the latest committed data on every statement, so rows
+        committed by other connections while it is open remain visible to it.
+
+        Returns:
+            None
+        """
+        pass
+
     @abstractmethod
     def commit(self) -> None:
         """
@@ -179,7 +254,8 @@ class SQLConnector(metaclass=ABCMeta):
             exc_value (Exception): The exception raised, if any.
             traceback (traceback): The traceback object associated with the exception, if any.
         """
-        self.close()
+        if not self.is_borrowed:
+            self.close()
 
     @abstractmethod
     def execute(self, query: str, data: tuple = ()) -> None:
@@ -195,6 +271,34 @@ class SQLConnector(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def execute_returning_id(self, query: str, data: tuple = ()) -> int:
+        """
+        Executes the given INSERT query and returns the auto-increment ID of the inserted row.
+
+        Args:
+            query (str): The SQL query to execute.
+            data (tuple, optional): The data parameters to be used in the query. Defaults to ().
+
+        Returns:
+            int: The auto-increment ID generated by the query.
+        """
+        pass
+
+    @abstractmethod
+    def execute_returning_rowcount(self, query: str, data: tuple = ()) -> int:
+        """
+        Executes the given SQL query and returns the number of rows it affected.
+
+        Args:
+            query (str): The SQL query to execute.
+            data (tuple, optional): The data parameters to be used in the query. Defaults to ().
+
+        Returns:
+            int: The number of rows affected by the query.
+        """
+        pass
+
     @abstractmethod
     def execute_many(self, query: str, data: list[tuple]) -> None:
         """
@@ -237,3 +341,19 @@ class SQLConnector(metaclass=ABCMeta):
             list: A list of tuples representing the rows fetched from the result set.
         """
         pass
+
+    @abstractmethod
+    def fetch_iter(self, query: str, data: tuple = ()) -> Iterator[tuple]:
+        """
+        Executes the given SQL query and yields the rows of the result set as they are read.
+
+        No other query may be executed on this connector until the iterator is exhausted or closed.
+
+        Args:
+            query (str): The SQL query to be executed.
+            data (tuple, optional): The parameters to be passed to the query. Defaults to ().
+
+        Yields:
+            tuple: The rows of the result set.
+        """
+        pass
@@ -1,9 +1,11 @@
+import os
 import threading
 from threading import Thread
 from abc import ABCMeta, abstractmethod
 from typing import Callable
 from multiprocessing import cpu_count
-from multiprocessing.pool import Pool
+from multiprocessing.pool import Pool, AsyncResult
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import ExitStack
 
 CPU_NUM = cpu_count()
@@ -12,6 +14,12 @@ POOL_CPU_LIMIT = max(CPU_NUM - 2, 1)
 MAX_THREADS = 2 * CPU_NUM
 SQL_SEMAPHORE = threading.Semaphore(POOL_CPU_LIMIT)
 
+# One executor per process, so that its worker threads are started once and
+# reused by every call instead of once per gallery. Keyed on the process ID,
+# since a forked pool worker inherits the dictionary but not the threads.
+_thread_pools = dict[int, ThreadPoolExecutor]()
+_thread_pools_lock = threading.Lock()
+
 
 def wrap_thread_target_with_semaphores(
     target: Callable,
@@ -60,13 +68,36 @@ class SQLThreadsList(ThreadsList):
         return [SQL_SEMAPHORE]
 
 
-def run_in_parallel(fun, args: list[tuple]) -> list:
+def create_process_pool() -> Pool:
+    return Pool(POOL_CPU_LIMIT)
+
+
+def run_in_parallel(fun, args: list[tuple], pool: Pool | None = None) -> list:
     if len(args) == 0:
         return list()
 
-    with Pool(POOL_CPU_LIMIT) as pool:
-        if len(args[0]) > 1:
-            results = pool.starmap(fun, args)
-        else:
-            results = pool.map(fun, [arg[0] for arg in args])
+    if pool is None:
+        with create_process_pool() as pool:
+            results = submit_in_parallel(pool, fun, args).get()
+    else:
+        results = submit_in_parallel(pool, fun, args).get()
     return results
+
+
+def submit_in_parallel(pool: Pool, fun, args: list[tuple]) -> AsyncResult:
+    if len(args) > 0 and len(args[0]) > 1:
+        return pool.starmap_async(fun, args)
+    return pool.map_async(fun, [arg[0] for arg in args])
+
+
+def submit_in_threads(fun, args: list[tuple]) -> list[Future]:
+    executor = _get_thread_pool()
+    return [executor.submit(fun, *arg) for arg in args]
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    pid = os.getpid()
+    with _thread_pools_lock:
+        if pid not in _thread_pools:
+            _thread_pools[pid] = ThreadPoolExecutor(POOL_CPU_LIMIT)
+        return _thread_pools[pid]
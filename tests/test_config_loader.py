@@ -0,0 +1,32 @@
+import unittest
+
+from h2hdb.config_loader import ConfigError, H2HConfig
+
+
+def make_h2h_config(hash_algorithms: list[str]) -> H2HConfig:
+    return H2HConfig(
+        download_path="download",
+        cbz_path="",
+        cbz_max_size=768,
+        cbz_grouping="flat",
+        cbz_sort="no",
+        hash_algorithms=hash_algorithms,
+    )
+
+
+class TestH2HConfig(unittest.TestCase):
+    def test_hash_algorithms(self) -> None:
+        config = make_h2h_config(["sha512", "blake2b"])
+        self.assertEqual(config.hash_algorithms, ["sha512", "blake2b"])
+
+    def test_unknown_hash_algorithm_is_rejected(self) -> None:
+        with self.assertRaises(ConfigError):
+            make_h2h_config(["sha512", "md5"])
+
+    def test_duplicated_hash_algorithm_is_rejected(self) -> None:
+        with self.assertRaises(ConfigError):
+            make_h2h_config(["sha512", "blake2b", "sha512"])
+
+
+if __name__ == "__main__":
+    unittest.main()
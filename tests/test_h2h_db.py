@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from h2hdb.config_loader import load_config
+from h2hdb.h2h_db import H2HDB
+from h2hdb.settings import GALLERY_INFO_FILE_NAME, hash_functions_by_file
+from h2hdb.sql_connector import DatabaseTransactionError
+
+
+class FakeConnector:
+    def __enter__(self) -> "FakeConnector":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
+
+class TestInsertGalleryInfo(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_directory.cleanup)
+        self.gallery_folder = os.path.join(self.tmp_directory.name, "gallery")
+        os.makedirs(self.gallery_folder)
+        self.galleryinfo_file = os.path.join(
+            self.gallery_folder, GALLERY_INFO_FILE_NAME
+        )
+        with open(self.galleryinfo_file, "w") as f:
+            f.write("Title: gallery\n")
+
+        config_path = os.path.join(self.tmp_directory.name, "config.json")
+        with open(config_path, "w") as f:
+            json.dump(
+                dict(
+                    h2h=dict(
+                        download_path=self.tmp_directory.name,
+                        cbz_path="",
+                        cbz_max_size=768,
+                        cbz_grouping="flat",
+                        hash_algorithms=["sha512", "blake2b"],
+                    ),
+                    database=dict(
+                        sql_type="mysql",
+                        host="localhost",
+                        port="3306",
+                        user="root",
+                        database="h2h",
+                        password="password",
+                    ),
+                    logger=dict(level="ERROR"),
+                ),
+                f,
+            )
+        self.h2hdb = H2HDB(load_config(config_path))
+        self.h2hdb.SQLConnector = FakeConnector
+
+        patcher = mock.patch(
+            "h2hdb.h2h_db.parse_galleryinfo",
+            return_value=SimpleNamespace(
+                gallery_name="gallery",
+                gallery_folder=self.gallery_folder,
+                files_path=[GALLERY_INFO_FILE_NAME],
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in (
+            "delete_gallery_file",
+            "delete_gallery",
+            "_get_unchanged_files_digests",
+        ):
+            patcher = mock.patch.object(H2HDB, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(H2HDB, "_insert_gallery_info")
+        self.insert_gallery_info = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored_row(self, *hash_values: bytes | None) -> tuple:
+        file_stat = os.stat(self.galleryinfo_file)
+        return (1, file_stat.st_size, file_stat.st_mtime_ns, *hash_values)
+
+    def test_unchanged_gallery_is_skipped(self) -> None:
+        digests = hash_functions_by_file(self.galleryinfo_file, ["sha512", "blake2b"])
+        with mock.patch.object(
+            H2HDB,
+            "_get_file_hashs_and_stat_by_gallery_name_and_file_name",
+            return_value=self.stored_row(digests["sha512"], digests["blake2b"]),
+        ):
+            self.assertFalse(self.h2hdb.insert_gallery_info(self.gallery_folder))
+        self.insert_gallery_info.assert_not_called()
+
+    def test_gallery_without_digest_of_added_algorithm_is_reinserted(self) -> None:
+        digests = hash_functions_by_file(self.galleryinfo_file, ["sha512"])
+        # blake2b was added to the config after the gallery was inserted, so
+        # its digest is missing although the stat of the info file matches.
+        with mock.patch.object(
+            H2HDB,
+            "_get_file_hashs_and_stat_by_gallery_name_and_file_name",
+            return_value=self.stored_row(digests["sha512"], None),
+        ):
+            self.assertTrue(self.h2hdb.insert_gallery_info(self.gallery_folder))
+        self.insert_gallery_info.assert_called_once()
+
+    def test_deadlocked_gallery_transaction_is_retried(self) -> None:
+        self.insert_gallery_info.side_effect = [
+            DatabaseTransactionError("Deadlock found when trying to get lock"),
+            None,
+        ]
+        with mock.patch.object(
+            H2HDB,
+            "_get_file_hashs_and_stat_by_gallery_name_and_file_name",
+            return_value=None,
+        ):
+            self.assertTrue(self.h2hdb.insert_gallery_info(self.gallery_folder))
+        self.assertEqual(self.insert_gallery_info.call_count, 2)
+        # The files are hashed once, before the first transaction opens.
+        for call in self.insert_gallery_info.call_args_list:
+            self.assertIn(self.galleryinfo_file, call.args[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()